@@ -51,7 +51,9 @@ echo    3. ✅ KEINE Windows-Warnung!
 echo.
 echo 🔧 OPTION 2 - EXE:
 echo    1. ZIP entpacken
-echo    2. Doppelklick auf ARXML_Merger.exe
+echo    2. Doppelklick auf ARXML_Merger\ARXML_Merger.exe
+echo       (immer den kompletten Ordner ARXML_Merger weitergeben,
+echo        die EXE braucht die Dateien daneben)
 echo    3. Bei Warnung: "Weitere Informationen" → "Trotzdem ausführen"
 echo.
 echo ✅ FUNKTIONIERT ENDLICH RICHTIG!
@@ -5,18 +5,99 @@ Dieser Modul implementiert die Kernfunktionalität für das intelligente Zusamme
 von AUTOSAR ARXML-Dateien mit vollständiger Signal-Preservation und Referenz-Integrität.
 """
 
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any, Callable, Iterable, Iterator, NamedTuple
 import logging
 from dataclasses import dataclass
 from enum import Enum
 import re
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+from utils import strip_namespace
+
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Puffergröße für die Ausgabedatei: wenige große write()-Aufrufe statt
+# vieler 8-KiB-Blöcke
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=256)
+def _qn(namespace: str, local: str) -> str:
+    """Baut einen qualifizierten Tag ("{ns}local") und interniert ihn."""
+    return sys.intern(f"{{{namespace}}}{local}" if namespace else local)
+
+
+def _namespace_of(tag: str) -> str:
+    """Liefert den Namespace eines Clark-Tags ('{ns}local') oder ''."""
+    return tag[1:tag.index('}')] if tag[:1] == '{' else ''
+
+
+def _advise_willneed(file_path: str) -> None:
+    """Bittet den Kernel, eine Datei asynchron in den Page-Cache zu lesen.
+    
+    Reiner Hinweis ohne Wirkung auf das Ergebnis; auf Plattformen ohne
+    posix_fadvise oder bei Fehlern passiert nichts.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class NsTags(NamedTuple):
+    """Vorberechnete qualifizierte Tags eines AUTOSAR-Namespace."""
+    pkg: str
+    pkgs: str
+    name: str
+    elements: str
+    find_pkgs: Callable[[Any], List[Any]]
+
+
+def _build_ns_tags(namespace: str) -> NsTags:
+    """Erstellt die NsTags einmal pro Merge statt pro rekursivem Aufruf."""
+    tag_pkg = _qn(namespace, "AR-PACKAGE")
+
+    if LXML_AVAILABLE:
+        # Kompiliertes XPath-Objekt wird über alle Ebenen wiederverwendet
+        if namespace:
+            find_pkgs = ET.XPath("ar:AR-PACKAGE", namespaces={'ar': namespace})
+        else:
+            find_pkgs = ET.XPath("AR-PACKAGE")
+    else:
+        def find_pkgs(parent):
+            return [child for child in parent if child.tag == tag_pkg]
+
+    return NsTags(
+        pkg=tag_pkg,
+        pkgs=_qn(namespace, "AR-PACKAGES"),
+        name=_qn(namespace, "SHORT-NAME"),
+        elements=_qn(namespace, "ELEMENTS"),
+        find_pkgs=find_pkgs
+    )
+
 
 class MergeStrategy(Enum):
     """Verfügbare Merge-Strategien."""
@@ -91,38 +172,59 @@ class ARXMLNamespaceManager:
     def get_qualified_tag(self, tag: str, prefix: str = '') -> str:
         """Gibt den vollqualifizierten Tag-Namen zurück."""
         if prefix in self.namespaces:
-            return f"{{{self.namespaces[prefix]}}}{tag}"
+            return _qn(self.namespaces[prefix], tag)
         elif self.default_namespace:
-            return f"{{{self.default_namespace}}}{tag}"
+            return _qn(self.default_namespace, tag)
         return tag
     
     def strip_namespace(self, tag: str) -> str:
         """Entfernt Namespace-Präfix von einem Tag."""
-        if '}' in tag:
-            return tag.split('}', 1)[1]
-        return tag
+        return strip_namespace(tag)
+
+
+@dataclass
+class SignalRecord:
+    """Verfolgtes Signal; __slots__ spart das Instanz-Dict pro Eintrag."""
+    __slots__ = ('element', 'source_file', 'short_name', 'data_type', 'length')
+    element: ET.Element
+    source_file: str
+    short_name: str
+    data_type: Optional[str]
+    length: Optional[int]
 
 
 class SignalTracker:
     """Verfolgt alle Signale während des Merge-Prozesses."""
     
     def __init__(self):
-        self.signals: Dict[str, Dict[str, Any]] = {}
+        self.signals: Dict[str, SignalRecord] = {}
         self.signal_groups: Dict[str, Dict[str, Any]] = {}
         self.interfaces: Dict[str, Dict[str, Any]] = {}
     
     def add_signal(self, signal_name: str, signal_element: ET.Element, source_file: str) -> None:
-        """Fügt ein Signal zur Verfolgung hinzu."""
-        self.signals[signal_name] = {
-            'element': signal_element,
-            'source_file': source_file,
-            'short_name': signal_name,
-            'data_type': self._extract_data_type(signal_element),
-            'length': self._extract_length(signal_element)
-        }
+        """Fügt ein Signal zur Verfolgung hinzu.
+        
+        Die erste Registrierung eines Namens gewinnt; Wiederholungen aus
+        weiteren Dateien werden ohne erneute Extraktion übersprungen.
+        """
+        if signal_name in self.signals:
+            return
+        # Namen wiederholen sich über viele Dateien: eine Kopie pro Wert
+        signal_name = sys.intern(signal_name)
+        self.signals[signal_name] = SignalRecord(
+            element=signal_element,
+            source_file=sys.intern(source_file),
+            short_name=signal_name,
+            data_type=self._extract_data_type(signal_element),
+            length=self._extract_length(signal_element)
+        )
     
     def add_signal_group(self, group_name: str, group_element: ET.Element, source_file: str) -> None:
-        """Fügt eine Signal-Gruppe zur Verfolgung hinzu."""
+        """Fügt eine Signal-Gruppe zur Verfolgung hinzu (erste Registrierung gewinnt)."""
+        if group_name in self.signal_groups:
+            return
+        group_name = sys.intern(group_name)
+        source_file = sys.intern(source_file)
         self.signal_groups[group_name] = {
             'element': group_element,
             'source_file': source_file,
@@ -131,7 +233,11 @@ class SignalTracker:
         }
     
     def add_interface(self, interface_name: str, interface_element: ET.Element, source_file: str) -> None:
-        """Fügt ein Interface zur Verfolgung hinzu."""
+        """Fügt ein Interface zur Verfolgung hinzu (erste Registrierung gewinnt)."""
+        if interface_name in self.interfaces:
+            return
+        interface_name = sys.intern(interface_name)
+        source_file = sys.intern(source_file)
         self.interfaces[interface_name] = {
             'element': interface_element,
             'source_file': source_file,
@@ -168,7 +274,7 @@ class ReferenceManager:
     """Verwaltet und löst Referenzen zwischen AUTOSAR-Elementen auf."""
     
     def __init__(self):
-        self.references: Dict[str, List[str]] = {}
+        self.references: Dict[str, List[str]] = defaultdict(list)
         self.definitions: Dict[str, ET.Element] = {}
     
     def register_definition(self, path: str, element: ET.Element) -> None:
@@ -177,49 +283,90 @@ class ReferenceManager:
     
     def register_reference(self, from_path: str, to_path: str) -> None:
         """Registriert eine Referenz zwischen Elementen."""
-        if from_path not in self.references:
-            self.references[from_path] = []
         self.references[from_path].append(to_path)
     
     def validate_references(self) -> List[str]:
         """Validiert alle Referenzen und gibt unaufgelöste zurück."""
-        unresolved = []
-        for from_path, to_paths in self.references.items():
-            for to_path in to_paths:
-                if to_path not in self.definitions:
-                    unresolved.append(f"{from_path} -> {to_path}")
-        return unresolved
+        # Ein Hash-Lookup pro eindeutigem Ziel statt pro Referenz
+        targets = {to_path for to_paths in self.references.values() for to_path in to_paths}
+        missing = targets - self.definitions.keys()
+        if not missing:
+            return []
+        return [
+            f"{from_path} -> {to_path}"
+            for from_path, to_paths in self.references.items()
+            for to_path in to_paths
+            if to_path in missing
+        ]
 
 
 class ARXMLMergerEngine:
     """Hauptklasse für das Zusammenführen von ARXML-Dateien."""
     
-    def __init__(self, strategy: MergeStrategy = MergeStrategy.CONSERVATIVE):
+    def __init__(self, strategy: MergeStrategy = MergeStrategy.CONSERVATIVE,
+                 strip_whitespace: bool = False, max_workers: Optional[int] = None):
         self.strategy = strategy
+        self.strip_whitespace = strip_whitespace
+        # None: Anzahl CPUs; 0 oder 1: seriell parsen
+        self.max_workers = max_workers
         self.namespace_manager = ARXMLNamespaceManager()
         self.signal_tracker = SignalTracker()
         self.reference_manager = ReferenceManager()
         self.conflicts: List[MergeConflict] = []
         self.warnings: List[str] = []
         self.errors: List[str] = []
+        self._base_file = ''
+        # SHORT-NAME-Zuordnungen der Basis-Container, gültig für einen Merge
+        self._name_maps: Dict[Any, Dict[Optional[str], ET.Element]] = {}
+        # Herkunftsdatei der Teilbäume, die aus späteren Eingaben übernommen
+        # wurden; alles ohne Eintrag erbt die Herkunft seines Containers
+        self._origins: Dict[Any, str] = {}
+        # Behandlung doppelter Elemente je Strategie (Standard: _keep_first)
+        self._duplicate_handlers: Dict[MergeStrategy, Callable[..., Tuple[ET.Element, str]]] = {
+            MergeStrategy.LATEST_WINS: self._keep_latest
+        }
+        # lxml-Parser sind nicht thread-sicher: ein Parser pro Thread
+        self._local = threading.local()
+    
+    def _parser_options(self) -> Dict[str, Any]:
+        """Gemeinsame lxml-Parser-Optionen für parse() und iterparse()."""
+        # collect_ids=False: kein xml:id-Index über den gesamten Baum;
+        # ARXML nutzt weder Entities noch externe DTDs
+        return {
+            'huge_tree': True,
+            'collect_ids': False,
+            'resolve_entities': False,
+            'no_network': True,
+            'remove_blank_text': self.strip_whitespace
+        }
+    
+    def _create_parser(self) -> Optional[Any]:
+        """Erstellt den XML-Parser (lxml) für große ARXML-Dateien."""
+        if not LXML_AVAILABLE:
+            return None
+        return ET.XMLParser(**self._parser_options())
+    
+    def _get_parser(self) -> Optional[Any]:
+        """Gibt den Parser des aktuellen Threads zurück."""
+        parser = getattr(self._local, 'parser', None)
+        if parser is None and LXML_AVAILABLE:
+            parser = self._local.parser = self._create_parser()
+        return parser
     
     def merge_files(self, input_files: List[str], output_file: Optional[str] = None) -> MergeResult:
         """Führt mehrere ARXML-Dateien zusammen."""
-        import time
         start_time = time.time()
         
-        logger.info(f"Starte Merge von {len(input_files)} Dateien mit Strategie: {self.strategy.value}")
+        logger.info("Starte Merge von %d Dateien mit Strategie: %s", len(input_files), self.strategy.value)
         
-        # Parse alle Eingabedateien
-        trees = []
-        for file_path in input_files:
-            tree = self._parse_arxml_file(file_path)
-            if tree:
-                trees.append((tree, file_path))
-            else:
-                self.errors.append(f"Konnte Datei nicht parsen: {file_path}")
+        # Parse die Eingabedateien lazy: neben dem Basis-Baum lebt immer nur
+        # der gerade zu mergende Baum im Speicher
+        trees = self._iter_parsed_trees(input_files)
         
-        if not trees:
+        # Führe Merge durch
+        merged_tree = self._merge_trees(trees)
+        
+        if merged_tree is None:
             return MergeResult(
                 success=False,
                 merged_tree=None,
@@ -231,9 +378,6 @@ class ARXMLMergerEngine:
                 errors=self.errors
             )
         
-        # Führe Merge durch
-        merged_tree = self._merge_trees(trees)
-        
         # Validiere Ergebnis
         preserved_signals = self.signal_tracker.get_all_signals()
         unresolved_refs = self.reference_manager.validate_references()
@@ -246,7 +390,7 @@ class ARXMLMergerEngine:
             self._write_merged_file(merged_tree, output_file)
         
         processing_time = time.time() - start_time
-        logger.info(f"Merge abgeschlossen in {processing_time:.2f}s")
+        logger.info("Merge abgeschlossen in %.2fs", processing_time)
         
         return MergeResult(
             success=True,
@@ -259,10 +403,90 @@ class ARXMLMergerEngine:
             errors=self.errors
         )
     
-    def _parse_arxml_file(self, file_path: str) -> Optional[ET.ElementTree]:
+    def _iter_parsed_trees(self, input_files: List[str]) -> Iterator[Tuple[ET.ElementTree, str]]:
+        """Parst die Eingabedateien; nur die erste wird vollständig geladen."""
+        remaining = iter(input_files)
+        
+        # Basis-Baum seriell parsen, bis eine Datei gelingt
+        for file_path in remaining:
+            tree = self._parse_arxml_file(file_path)
+            if tree is not None:
+                yield tree, file_path
+                break
+            self.errors.append(f"Konnte Datei nicht parsen: {file_path}")
+        
+        if LXML_AVAILABLE and self.max_workers != 0 and self.max_workers != 1:
+            parsed = self._parse_parallel(list(remaining))
+        else:
+            # ElementTree hält beim Parsen den GIL, Threads bringen hier nichts
+            parsed = self._parse_serial(list(remaining))
+        
+        for file_path, tree in parsed:
+            if tree is not None:
+                yield tree, file_path
+            else:
+                self.errors.append(f"Konnte Datei nicht parsen: {file_path}")
+    
+    def _parse_serial(self, file_paths: List[str]) -> Iterator[Tuple[str, Optional[ET.ElementTree]]]:
+        """Parst Dateien nacheinander; die jeweils nächste liest der Kernel vorab ein."""
+        for index, file_path in enumerate(file_paths):
+            if index + 1 < len(file_paths):
+                _advise_willneed(file_paths[index + 1])
+            yield file_path, self._parse_arxml_file(file_path, True)
+    
+    def _parse_parallel(self, file_paths: List[str]) -> Iterator[Tuple[str, Optional[ET.ElementTree]]]:
+        """Parst Dateien in einem Thread-Pool und liefert sie in Eingabereihenfolge.
+        
+        Es werden höchstens so viele Dateien vorausgeparst wie Worker laufen,
+        damit der Speicherbedarf trotz Parallelität begrenzt bleibt. Die Worker
+        parsen nur; Fehler und Namespaces übernimmt der verbrauchende Thread in
+        Eingabereihenfolge, damit das Ergebnis nicht vom Thread-Timing abhängt.
+        """
+        if not file_paths:
+            return
+        
+        workers = min(len(file_paths), self.max_workers or os.cpu_count() or 4)
+        paths = iter(file_paths)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque(
+                (path, executor.submit(self._load_arxml_file, path, True))
+                for path in islice(paths, workers)
+            )
+            while pending:
+                file_path, future = pending.popleft()
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append((next_path, executor.submit(self._load_arxml_file, next_path, True)))
+                tree, errors = future.result()
+                yield file_path, self._register_parsed(file_path, tree, errors)
+    
+    def _parse_arxml_file(self, file_path: str, packages_only: bool = False) -> Optional[ET.ElementTree]:
         """Parst eine ARXML-Datei und registriert alle Elemente."""
+        tree, errors = self._load_arxml_file(file_path, packages_only)
+        return self._register_parsed(file_path, tree, errors)
+    
+    def _load_arxml_file(self, file_path: str,
+                         packages_only: bool = False) -> Tuple[Optional[ET.ElementTree], List[str]]:
+        """Parst eine ARXML-Datei ohne Zugriff auf den Zustand der Engine.
+        
+        Thread-sicher: Fehler werden zurückgegeben statt in self.errors
+        geschrieben.
+        """
+        try:
+            return self._load_arxml_tree(file_path, packages_only), []
+        except ET.ParseError as e:
+            return None, [f"XML-Parse-Fehler in {file_path}: {e}"]
+        except Exception as e:
+            return None, [f"Unerwarteter Fehler beim Parsen von {file_path}: {e}"]
+    
+    def _register_parsed(self, file_path: str, tree: Optional[ET.ElementTree],
+                         errors: List[str]) -> Optional[ET.ElementTree]:
+        """Übernimmt Fehler, Namespaces und Elemente einer geparsten Datei."""
+        self.errors.extend(errors)
+        if tree is None:
+            return None
         try:
-            tree = ET.parse(file_path)
             root = tree.getroot()
             
             # Registriere Namespaces
@@ -273,59 +497,324 @@ class ARXMLMergerEngine:
             
             return tree
             
-        except ET.ParseError as e:
-            self.errors.append(f"XML-Parse-Fehler in {file_path}: {e}")
-            return None
         except Exception as e:
             self.errors.append(f"Unerwarteter Fehler beim Parsen von {file_path}: {e}")
             return None
     
+    def _load_arxml_tree(self, file_path: str, packages_only: bool = False) -> ET.ElementTree:
+        """Lädt den DOM einer Datei, ohne Elemente zu registrieren.
+        
+        Nur der Basis-Baum wird vollständig gebraucht; bei allen weiteren
+        Dateien genügt der AR-PACKAGES-Teilbaum, den ElementTree per
+        iterparse lädt, während die übrigen Geschwister sofort verworfen werden.
+        """
+        if packages_only:
+            return self._parse_packages_only(file_path)
+        return ET.parse(file_path, self._get_parser())
+    
+    def _parse_packages_only(self, file_path: str) -> ET.ElementTree:
+        """Parst eine Datei und verwirft alles außer dem AR-PACKAGES-Teilbaum."""
+        if LXML_AVAILABLE:
+            # libxml2 baut den Baum komplett in C; ein iterparse-Event pro
+            # Element in Python wäre hier teurer als die wenigen kleinen
+            # Geschwister (ADMIN-DATA etc.), die danach entfernt werden
+            tree = ET.parse(file_path, self._get_parser())
+            root = tree.getroot()
+            pkgs_tag = _qn(_namespace_of(root.tag), 'AR-PACKAGES')
+            for child in list(root):
+                if child.tag != pkgs_tag:
+                    root.remove(child)
+            return tree
+        
+        context = ET.iterparse(file_path, events=('start', 'end'))
+        root = None
+        pkgs_tag = None
+        depth = 0
+        for event, elem in context:
+            if event == 'start':
+                if root is None:
+                    root = elem
+                    pkgs_tag = _qn(_namespace_of(elem.tag), 'AR-PACKAGES')
+                depth += 1
+                continue
+            
+            depth -= 1
+            # Direkte Kinder von AUTOSAR (ADMIN-DATA etc.) sofort freigeben
+            if depth == 1 and elem.tag != pkgs_tag:
+                elem.clear()
+                root.remove(elem)
+        
+        return ET.ElementTree(root)
+    
     def _scan_elements(self, root: ET.Element, source_file: str) -> None:
         """Scannt alle wichtigen AUTOSAR-Elemente in einem Baum."""
         # Implementierung für Element-Scanning
         pass
     
-    def _merge_trees(self, trees: List[Tuple[ET.ElementTree, str]]) -> Optional[ET.ElementTree]:
+    def _merge_trees(self, trees: Iterable[Tuple[ET.ElementTree, str]]) -> Optional[ET.ElementTree]:
         """Führt mehrere ElementTrees zusammen."""
-        if not trees:
+        trees = iter(trees)
+        first = next(trees, None)
+        if first is None:
             return None
         
         # Verwende ersten Baum als Basis
-        base_tree, base_file = trees[0]
+        base_tree, base_file = first
         base_root = base_tree.getroot()
+        self._base_file = base_file
+        
+        namespace = _namespace_of(base_root.tag)
+        tags = _build_ns_tags(namespace)
+        if namespace and not LXML_AVAILABLE:
+            # lxml übernimmt die nsmap aus dem Quellbaum; ElementTree würde
+            # ohne Registrierung beim Schreiben ns0:-Präfixe erzeugen
+            ET.register_namespace('', namespace)
         
         # Merge alle anderen Bäume
-        for tree, source_file in trees[1:]:
-            self._merge_single_tree(base_root, tree.getroot(), source_file)
+        self._name_maps = {}
+        self._origins = {}
+        try:
+            for tree, source_file in trees:
+                new_root = tree.getroot()
+                self._merge_single_tree(base_root, new_root, source_file, tags)
+                # Quellbäume sind Wegwerfware: übernommene Knoten hängen bereits
+                # per Referenz im Basis-Baum (kein deepcopy), der Rest wird sofort
+                # freigegeben statt erst nach dem Parsen der nächsten Datei
+                new_root.clear()
+        finally:
+            self._name_maps = {}
+            self._origins = {}
         
         return base_tree
     
-    def _merge_single_tree(self, base_root: ET.Element, new_root: ET.Element, source_file: str) -> None:
+    def _merge_single_tree(self, base_root: ET.Element, new_root: ET.Element,
+                           source_file: str, tags: NsTags) -> None:
         """Führt einen einzelnen Baum in den Basis-Baum ein."""
-        # Implementierung für Single-Tree-Merge
-        pass
-    
+        base_packages = self._find_child(base_root, tags.pkgs)
+        new_packages = self._find_child(new_root, tags.pkgs)
+        if new_packages is None:
+            return
+        if base_packages is None:
+            base_root.append(new_packages)
+            self._origins[new_packages] = source_file
+            return
+
+        self._merge_packages(base_packages, new_packages, source_file, tags)
+
+    def _merge_packages(self, base_pkgs: ET.Element, new_pkgs: ET.Element,
+                        source_file: str, tags: NsTags) -> None:
+        """Führt zwei AR-PACKAGES-Hierarchien zusammen.
+        
+        Verschachtelte AR-PACKAGES werden über einen expliziten Stack statt
+        per Rekursion abgearbeitet (keine Frame-Kosten, kein Rekursionslimit).
+        """
+        stack = [(base_pkgs, new_pkgs, self._origins.get(base_pkgs, self._base_file))]
+        while stack:
+            base_parent, new_parent, origin = stack.pop()
+            
+            base_map = self._name_map(base_parent, tags.find_pkgs, tags.name)
+            
+            # find_pkgs liefert eine Liste: append() darf new_parent verändern
+            new_children = tags.find_pkgs(new_parent)
+            names = [self._get_short_name(pkg, tags.name) for pkg in new_children]
+            if self._bulk_append(base_parent, base_map, names, new_children, source_file):
+                continue
+            
+            for name, pkg in zip(names, new_children):
+                base_pkg = base_map.get(name)
+                if base_pkg is None:
+                    base_parent.append(pkg)
+                    base_map[name] = pkg
+                    self._origins[pkg] = source_file
+                    continue
+                
+                pkg_origin = self._origins.get(base_pkg, origin)
+                sub_pkgs = self._merge_package_content(base_pkg, pkg, source_file, tags, pkg_origin)
+                if sub_pkgs is not None:
+                    base_sub_pkgs, new_sub_pkgs = sub_pkgs
+                    stack.append((base_sub_pkgs, new_sub_pkgs,
+                                  self._origins.get(base_sub_pkgs, pkg_origin)))
+
+    def _merge_package_content(self, base_pkg: ET.Element, new_pkg: ET.Element,
+                               source_file: str, tags: NsTags, origin: str
+                               ) -> Optional[Tuple[ET.Element, ET.Element]]:
+        """Führt ELEMENTS eines gleichnamigen AR-PACKAGE zusammen.
+        
+        origin ist die Datei, aus der base_pkg stammt. Gibt das Paar der
+        Unter-AR-PACKAGES zurück, falls beide Seiten welche haben und diese
+        noch zusammengeführt werden müssen.
+        """
+        new_elements = self._find_child(new_pkg, tags.elements)
+        if new_elements is not None:
+            base_elements = self._find_child(base_pkg, tags.elements)
+            if base_elements is None:
+                # Schema-Reihenfolge: ELEMENTS steht vor AR-PACKAGES
+                base_sub_pkgs = self._find_child(base_pkg, tags.pkgs)
+                if base_sub_pkgs is None:
+                    base_pkg.append(new_elements)
+                else:
+                    base_pkg.insert(list(base_pkg).index(base_sub_pkgs), new_elements)
+                self._origins[new_elements] = source_file
+            else:
+                self._merge_elements(base_elements, new_elements, source_file, tags.name,
+                                     self._origins.get(base_elements, origin))
+
+        new_sub_pkgs = self._find_child(new_pkg, tags.pkgs)
+        if new_sub_pkgs is None:
+            return None
+        base_sub_pkgs = self._find_child(base_pkg, tags.pkgs)
+        if base_sub_pkgs is None:
+            base_pkg.append(new_sub_pkgs)
+            self._origins[new_sub_pkgs] = source_file
+            return None
+        return base_sub_pkgs, new_sub_pkgs
+
+    def _merge_elements(self, base_elements: ET.Element, new_elements: ET.Element,
+                        source_file: str, tag_name: str, origin: str) -> None:
+        """Führt die Kinder zweier ELEMENTS-Container anhand des SHORT-NAME zusammen.
+        
+        origin ist die Datei, aus der base_elements stammt.
+        """
+        # Strategie einmal pro Container auflösen statt pro Konflikt zu vergleichen
+        resolve_duplicate = self._duplicate_handlers.get(self.strategy, self._keep_first)
+        
+        base_map = self._name_map(base_elements, self._element_children, tag_name)
+
+        new_children = self._element_children(new_elements)
+        names = [self._get_short_name(element, tag_name) for element in new_children]
+        if self._bulk_append(base_elements, base_map, names, new_children, source_file):
+            return
+
+        for name, element in zip(names, new_children):
+            existing = base_map.get(name)
+            if existing is None:
+                base_elements.append(element)
+                base_map[name] = element
+                self._origins[element] = source_file
+                continue
+
+            element_type = self.namespace_manager.strip_namespace(element.tag)
+            existing_origin = self._origins.get(existing, origin)
+            kept, resolution = resolve_duplicate(base_elements, existing, element)
+            base_map[name] = kept
+            if kept is not existing:
+                self._origins[kept] = source_file
+
+            self.conflicts.append(MergeConflict(
+                element_type=element_type,
+                element_name=name or '',
+                source_file_1=existing_origin,
+                source_file_2=source_file,
+                conflict_type="duplicate_element",
+                description=f"{element_type} '{name}' ist in mehreren Dateien definiert",
+                resolution=resolution
+            ))
+
+    def _name_map(self, parent: ET.Element, children: Callable[[ET.Element], Iterable[ET.Element]],
+                  tag_name: str) -> Dict[Optional[str], ET.Element]:
+        """Liefert die SHORT-NAME-Zuordnung der Kinder eines Basis-Containers.
+        
+        Die Zuordnung wird einmal pro Merge-Vorgang aufgebaut und danach bei
+        append/replace fortgeschrieben, statt für jede weitere Datei neu
+        erstellt zu werden. Schlüssel ist das Element selbst; so bleibt unter
+        lxml auch das Proxy-Objekt und damit seine Identität erhalten.
+        """
+        name_map = self._name_maps.get(parent)
+        if name_map is None:
+            name_map = {}
+            for child in children(parent):
+                name_map[self._get_short_name(child, tag_name)] = child
+            self._name_maps[parent] = name_map
+        return name_map
+
+    def _bulk_append(self, base_parent: ET.Element, base_map: Dict[Optional[str], ET.Element],
+                     names: List[Optional[str]], children: List[ET.Element],
+                     source_file: str) -> bool:
+        """Hängt alle Kinder auf einmal an, falls es keinerlei Überschneidung gibt.
+        
+        Die Planung läuft über Namenslisten und Mengenoperationen; nur wenn
+        kein Name im Basis-Container existiert und keiner doppelt vorkommt,
+        wird per extend() übernommen. Sonst entscheidet der Aufrufer pro Kind.
+        """
+        name_set = set(names)
+        if len(name_set) != len(names) or not name_set.isdisjoint(base_map):
+            return False
+        base_parent.extend(children)
+        base_map.update(zip(names, children))
+        self._origins.update(dict.fromkeys(children, source_file))
+        return True
+
+    @staticmethod
+    def _element_children(parent: ET.Element) -> List[ET.Element]:
+        """Direkte Kinder eines ELEMENTS-Containers ohne Kommentare/PIs."""
+        return [child for child in parent if isinstance(child.tag, str)]
+
+    def _keep_first(self, base_elements: ET.Element, existing: ET.Element,
+                    element: ET.Element) -> Tuple[ET.Element, str]:
+        """Behält das bereits vorhandene Element."""
+        return existing, "kept_first"
+
+    def _keep_latest(self, base_elements: ET.Element, existing: ET.Element,
+                     element: ET.Element) -> Tuple[ET.Element, str]:
+        """Ersetzt das vorhandene Element durch das neue."""
+        self._replace_child(base_elements, existing, element)
+        return element, "latest_wins"
+
+    @staticmethod
+    def _find_child(parent: ET.Element, tag: str) -> Optional[ET.Element]:
+        """Findet das erste direkte Kind mit dem gegebenen (qualifizierten) Tag."""
+        for child in parent:
+            if child.tag == tag:
+                return child
+        return None
+
+    @staticmethod
+    def _replace_child(parent: ET.Element, old: ET.Element, new: ET.Element) -> None:
+        """Ersetzt ein direktes Kind an seiner Position."""
+        if LXML_AVAILABLE:
+            # Zeigeroperation in libxml2, keine Suche über alle Kinder
+            parent.replace(old, new)
+        else:
+            parent[list(parent).index(old)] = new
+
+    @staticmethod
+    def _get_short_name(element: ET.Element, tag_name: str) -> Optional[str]:
+        """Liest den SHORT-NAME, der laut Schema das erste Kind ist."""
+        # Index 0 statt len(): lxml zählt für len() alle Kinder ab
+        try:
+            first = element[0]
+        except IndexError:
+            return None
+        if first.tag == tag_name:
+            return first.text
+        return element.findtext(tag_name)
+
     def _write_merged_file(self, tree: ET.ElementTree, output_file: str) -> None:
         """Schreibt den gemergten Baum in eine Datei."""
         try:
-            # Formatiere XML schön
-            self._indent_xml(tree.getroot())
+            # Formatiere XML schön: lxml rückt in C ein, ElementTree ab Python 3.9
+            if hasattr(ET, 'indent'):
+                ET.indent(tree, space="  ")
+                tree.getroot().tail = "\n"
+            else:
+                self._indent_xml(tree.getroot())
             
             # Schreibe mit XML-Deklaration
-            tree.write(
-                output_file,
-                encoding='utf-8',
-                xml_declaration=True,
-                method='xml'
-            )
+            with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                tree.write(
+                    f,
+                    encoding='utf-8',
+                    xml_declaration=True,
+                    method='xml'
+                )
             
-            logger.info(f"Merged ARXML geschrieben nach: {output_file}")
+            logger.info("Merged ARXML geschrieben nach: %s", output_file)
             
         except Exception as e:
             self.errors.append(f"Fehler beim Schreiben der Ausgabedatei: {e}")
     
     def _indent_xml(self, elem: ET.Element, level: int = 0) -> None:
-        """Formatiert XML für bessere Lesbarkeit."""
+        """Formatiert XML für bessere Lesbarkeit (Fallback ohne ET.indent)."""
         indent = "\n" + level * "  "
         if len(elem):
             if not elem.text or not elem.text.strip():
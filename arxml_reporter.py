@@ -7,19 +7,36 @@ Signal-Inventare und Performance-Metriken.
 
 import json
 import csv
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass, asdict
+import sys
+from html import escape
+from typing import Callable, Dict, List, Any, Optional, Set
+from dataclasses import dataclass
 from datetime import datetime
-import xml.etree.ElementTree as ET
 from pathlib import Path
 import logging
 
+from utils import shallow_asdict, strip_namespace
+
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class SignalInfo:
     """Informationen über ein Signal."""
+    __slots__ = ('name', 'source_file', 'data_type', 'length', 'interface', 'description', 'path')
     name: str
     source_file: str
     data_type: Optional[str]
@@ -32,6 +49,7 @@ class SignalInfo:
 @dataclass
 class InterfaceInfo:
     """Informationen über ein Interface."""
+    __slots__ = ('name', 'source_file', 'interface_type', 'signals', 'operations', 'path')
     name: str
     source_file: str
     interface_type: str
@@ -43,6 +61,8 @@ class InterfaceInfo:
 @dataclass
 class ConflictInfo:
     """Informationen über einen Konflikt."""
+    __slots__ = ('element_type', 'element_name', 'conflict_type', 'source_files',
+                 'resolution_strategy', 'description', 'warnings')
     element_type: str
     element_name: str
     conflict_type: str
@@ -55,6 +75,9 @@ class ConflictInfo:
 @dataclass
 class PerformanceMetrics:
     """Performance-Metriken für den Merge-Vorgang."""
+    __slots__ = ('total_processing_time', 'parsing_time', 'merging_time', 'validation_time',
+                 'writing_time', 'memory_peak_usage', 'input_files_count', 'total_input_size',
+                 'output_size', 'elements_processed')
     total_processing_time: float
     parsing_time: float
     merging_time: float
@@ -70,6 +93,9 @@ class PerformanceMetrics:
 @dataclass
 class MergeReport:
     """Vollständiger Merge-Bericht."""
+    __slots__ = ('timestamp', 'input_files', 'output_file', 'merge_strategy', 'success',
+                 'signals', 'interfaces', 'conflicts', 'performance', 'warnings', 'errors',
+                 'validation_results')
     timestamp: str
     input_files: List[str]
     output_file: str
@@ -84,37 +110,89 @@ class MergeReport:
     validation_results: Dict[str, Any]
 
 
+def _local_finder(*local_names: str) -> Callable[[Any], Optional[Any]]:
+    """Kompiliert die Suche nach dem ersten Nachfahren-Pfad über lokale Namen.
+    
+    Unter lxml entsteht ein einmal kompiliertes XPath-Objekt; ElementTree
+    kennt kein local-name(), aber den Namespace-Wildcard {*}.
+    """
+    if LXML_AVAILABLE:
+        steps = '//'.join(f'*[local-name()="{name}"]' for name in local_names)
+        xpath = ET.XPath(f'.//{steps}[1]')
+        
+        def find(element):
+            found = xpath(element)
+            return found[0] if found else None
+        return find
+    
+    path = './/' + '//'.join(f'{{*}}{name}' for name in local_names)
+    
+    def find(element):
+        return element.find(path)
+    return find
+
+
+def _html(value: Any) -> str:
+    """Wandelt einen Wert in Text um und maskiert ihn für HTML."""
+    return escape(str(value))
+
+
+def _report_to_dict(report: MergeReport) -> Dict[str, Any]:
+    """Wandelt einen MergeReport für json.dump um.
+    
+    asdict() kopiert jede verschachtelte Liste und Dataclass rekursiv; für
+    das Serialisieren genügt es, die Dataclasses eine Ebene tief aufzulösen.
+    """
+    data = shallow_asdict(report)
+    data['signals'] = [shallow_asdict(signal) for signal in report.signals]
+    data['interfaces'] = [shallow_asdict(interface) for interface in report.interfaces]
+    data['conflicts'] = [shallow_asdict(conflict) for conflict in report.conflicts]
+    data['performance'] = shallow_asdict(report.performance)
+    return data
+
+
 class SignalInventoryGenerator:
     """Erstellt ein vollständiges Signal-Inventar."""
     
+    # Einmal pro Prozess kompiliert statt bei jedem Element neu
+    _find_short_name = staticmethod(_local_finder('SHORT-NAME'))
+    _find_type_tref = staticmethod(_local_finder('TYPE-TREF'))
+    _find_length = staticmethod(_local_finder('LENGTH'))
+    _find_desc_p = staticmethod(_local_finder('DESC', 'P'))
+    
+    _INTERFACE_TAGS = frozenset(('SENDER-RECEIVER-INTERFACE', 'CLIENT-SERVER-INTERFACE'))
+    
     def __init__(self):
         self.signals: Dict[str, SignalInfo] = {}
+        # Signal-Gruppen stehen zusätzlich in signals und verdrängen dort
+        # gleichnamige I-SIGNALs
+        self.signal_groups: Dict[str, SignalInfo] = {}
         self.interfaces: Dict[str, InterfaceInfo] = {}
     
     def scan_tree(self, tree: ET.ElementTree, source_file: str) -> None:
-        """Scannt einen XML-Baum nach Signalen und Interfaces."""
-        root = tree.getroot()
-        
-        # Scanne nach I-Signalen
-        for signal_elem in root.iter():
-            if self._get_tag_name(signal_elem.tag) == 'I-SIGNAL':
-                self._process_signal(signal_elem, source_file)
+        """Scannt einen XML-Baum nach Signalen und Interfaces.
         
-        # Scanne nach Signal-Gruppen
-        for group_elem in root.iter():
-            if self._get_tag_name(group_elem.tag) == 'I-SIGNAL-GROUP':
-                self._process_signal_group(group_elem, source_file)
+        Ein einziger Durchlauf über den Baum. Pro Name gewinnt der erste
+        Eintrag (Dokument- bzw. Dateireihenfolge); spätere Vorkommen werden
+        übersprungen, bevor ihre Details extrahiert werden. Eine Signal-Gruppe
+        ersetzt ein gleichnamiges I-SIGNAL unabhängig von der Reihenfolge.
+        """
+        root = tree.getroot()
+        source_file = sys.intern(source_file)
         
-        # Scanne nach Interfaces
-        for interface_elem in root.iter():
-            tag_name = self._get_tag_name(interface_elem.tag)
-            if tag_name in ['SENDER-RECEIVER-INTERFACE', 'CLIENT-SERVER-INTERFACE']:
-                self._process_interface(interface_elem, source_file)
+        for elem in root.iter():
+            tag_name = strip_namespace(elem.tag)
+            if tag_name == 'I-SIGNAL':
+                self._process_signal(elem, source_file)
+            elif tag_name == 'I-SIGNAL-GROUP':
+                self._process_signal_group(elem, source_file)
+            elif tag_name in self._INTERFACE_TAGS:
+                self._process_interface(elem, source_file)
     
     def _process_signal(self, signal_elem: ET.Element, source_file: str) -> None:
         """Verarbeitet ein I-Signal."""
         short_name = self._get_short_name(signal_elem)
-        if not short_name:
+        if not short_name or short_name in self.signals:
             return
         
         signal_info = SignalInfo(
@@ -132,17 +210,17 @@ class SignalInventoryGenerator:
     def _process_signal_group(self, group_elem: ET.Element, source_file: str) -> None:
         """Verarbeitet eine Signal-Gruppe."""
         short_name = self._get_short_name(group_elem)
-        if not short_name:
+        if not short_name or short_name in self.signal_groups:
             return
         
         # Extrahiere Signale der Gruppe
+        # Namespace-Wildcard-Pfad statt Tag-Vergleich pro Nachfahre in Python
         group_signals = []
-        for signal_ref in group_elem.iter():
-            if self._get_tag_name(signal_ref.tag) == 'I-SIGNAL-REF':
-                ref_path = signal_ref.text
-                if ref_path:
-                    signal_name = ref_path.split('/')[-1]
-                    group_signals.append(signal_name)
+        for signal_ref in group_elem.iterfind('.//{*}I-SIGNAL-REF'):
+            ref_path = signal_ref.text
+            if ref_path:
+                signal_name = ref_path.split('/')[-1]
+                group_signals.append(signal_name)
         
         # Erstelle Signal-Info für die Gruppe
         signal_info = SignalInfo(
@@ -155,31 +233,32 @@ class SignalInventoryGenerator:
             path=self._get_element_path(group_elem)
         )
         
+        self.signal_groups[short_name] = signal_info
         self.signals[short_name] = signal_info
     
     def _process_interface(self, interface_elem: ET.Element, source_file: str) -> None:
         """Verarbeitet ein Interface."""
         short_name = self._get_short_name(interface_elem)
-        if not short_name:
+        if not short_name or short_name in self.interfaces:
             return
         
-        interface_type = self._get_tag_name(interface_elem.tag)
+        interface_type = strip_namespace(interface_elem.tag)
         
-        # Extrahiere Signale
+        # Extrahiere Signale und Operationen (für Client-Server-Interfaces)
+        # in einem gemeinsamen Durchlauf über den Teilbaum
         signals = []
-        for data_elem in interface_elem.iter():
-            if self._get_tag_name(data_elem.tag) == 'DATA-ELEMENT':
-                elem_name = self._get_short_name(data_elem)
-                if elem_name:
-                    signals.append(elem_name)
-        
-        # Extrahiere Operationen (für Client-Server-Interfaces)
         operations = []
-        for op_elem in interface_elem.iter():
-            if self._get_tag_name(op_elem.tag) == 'OPERATION':
-                op_name = self._get_short_name(op_elem)
-                if op_name:
-                    operations.append(op_name)
+        for child in interface_elem.iter():
+            tag_name = strip_namespace(child.tag)
+            if tag_name == 'DATA-ELEMENT':
+                target = signals
+            elif tag_name == 'OPERATION':
+                target = operations
+            else:
+                continue
+            child_name = self._get_short_name(child)
+            if child_name:
+                target.append(child_name)
         
         interface_info = InterfaceInfo(
             name=short_name,
@@ -192,28 +271,25 @@ class SignalInventoryGenerator:
         
         self.interfaces[short_name] = interface_info
     
-    def _get_tag_name(self, tag: str) -> str:
-        """Extrahiert den Tag-Namen ohne Namespace."""
-        if '}' in tag:
-            return tag.split('}', 1)[1]
-        return tag
-    
     def _get_short_name(self, element: ET.Element) -> Optional[str]:
         """Extrahiert den SHORT-NAME eines Elements."""
-        short_name_elem = element.find('.//*[local-name()="SHORT-NAME"]')
-        return short_name_elem.text if short_name_elem is not None else None
+        short_name_elem = self._find_short_name(element)
+        if short_name_elem is None or short_name_elem.text is None:
+            return None
+        # Dieselben Namen tauchen in vielen Dateien auf: eine Kopie pro Wert
+        return sys.intern(short_name_elem.text)
     
     def _extract_data_type(self, element: ET.Element) -> Optional[str]:
         """Extrahiert den Datentyp eines Signals."""
         # Suche nach TYPE-TREF
-        type_ref = element.find('.//*[local-name()="TYPE-TREF"]')
+        type_ref = self._find_type_tref(element)
         if type_ref is not None and type_ref.text:
-            return type_ref.text.split('/')[-1]
+            return sys.intern(type_ref.text.rpartition('/')[2])
         return None
     
     def _extract_length(self, element: ET.Element) -> Optional[int]:
         """Extrahiert die Länge eines Signals."""
-        length_elem = element.find('.//*[local-name()="LENGTH"]')
+        length_elem = self._find_length(element)
         if length_elem is not None and length_elem.text:
             try:
                 return int(length_elem.text)
@@ -228,17 +304,15 @@ class SignalInventoryGenerator:
     
     def _extract_description(self, element: ET.Element) -> Optional[str]:
         """Extrahiert die Beschreibung eines Elements."""
-        desc_elem = element.find('.//*[local-name()="DESC"]')
-        if desc_elem is not None:
-            p_elem = desc_elem.find('.//*[local-name()="P"]')
-            if p_elem is not None and p_elem.text:
-                return p_elem.text.strip()
+        p_elem = self._find_desc_p(element)
+        if p_elem is not None and p_elem.text:
+            return p_elem.text.strip()
         return None
     
     def _get_element_path(self, element: ET.Element) -> str:
         """Erstellt einen Pfad für ein Element."""
         # Vereinfachte Implementierung
-        return f"/{self._get_tag_name(element.tag)}"
+        return f"/{strip_namespace(element.tag)}"
     
     def get_signal_summary(self) -> Dict[str, Any]:
         """Erstellt eine Zusammenfassung aller Signale."""
@@ -323,8 +397,14 @@ class ReportGenerator:
     def save_report_json(self, report: MergeReport, output_path: str) -> None:
         """Speichert den Bericht als JSON-Datei."""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(asdict(report), f, indent=2, ensure_ascii=False)
+            if ORJSON_AVAILABLE:
+                # orjson serialisiert Dataclasses nativ in C direkt nach
+                # UTF-8-Bytes, ohne Zwischen-Dicts
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(_report_to_dict(report), f, indent=2, ensure_ascii=False)
             logger.info(f"JSON-Bericht gespeichert: {output_path}")
         except Exception as e:
             logger.error(f"Fehler beim Speichern des JSON-Berichts: {e}")
@@ -341,9 +421,9 @@ class ReportGenerator:
                     'Interface', 'Description', 'Path'
                 ])
                 
-                # Daten
-                for signal in report.signals:
-                    writer.writerow([
+                # Daten: writerows iteriert im C-Teil des csv-Moduls
+                writer.writerows(
+                    (
                         signal.name,
                         signal.source_file,
                         signal.data_type or '',
@@ -351,7 +431,9 @@ class ReportGenerator:
                         signal.interface or '',
                         signal.description or '',
                         signal.path
-                    ])
+                    )
+                    for signal in report.signals
+                )
             
             logger.info(f"Signal-Inventar CSV gespeichert: {output_path}")
         except Exception as e:
@@ -370,8 +452,8 @@ class ReportGenerator:
                 ])
                 
                 # Daten
-                for conflict in report.conflicts:
-                    writer.writerow([
+                writer.writerows(
+                    (
                         conflict.element_type,
                         conflict.element_name,
                         conflict.conflict_type,
@@ -379,7 +461,9 @@ class ReportGenerator:
                         conflict.resolution_strategy,
                         conflict.description,
                         '; '.join(conflict.warnings)
-                    ])
+                    )
+                    for conflict in report.conflicts
+                )
             
             logger.info(f"Konflikt-Bericht CSV gespeichert: {output_path}")
         except Exception as e:
@@ -425,15 +509,15 @@ class ReportGenerator:
         <p><strong>Zeitstempel:</strong> {report.timestamp}</p>
         <p><strong>Status:</strong> <span class="{'success' if report.success else 'error'}">
             {'Erfolgreich' if report.success else 'Fehlgeschlagen'}</span></p>
-        <p><strong>Merge-Strategie:</strong> {report.merge_strategy}</p>
+        <p><strong>Merge-Strategie:</strong> {_html(report.merge_strategy)}</p>
     </div>
     
     <div class="section">
         <h2>Eingabedateien</h2>
         <ul>
-            {''.join(f'<li>{file}</li>' for file in report.input_files)}
+            {''.join(f'<li>{_html(file)}</li>' for file in report.input_files)}
         </ul>
-        <p><strong>Ausgabedatei:</strong> {report.output_file}</p>
+        <p><strong>Ausgabedatei:</strong> {_html(report.output_file)}</p>
     </div>
     
     <div class="section">
@@ -488,11 +572,11 @@ class ReportGenerator:
         for conflict in conflicts:
             rows.append(f"""
                 <tr>
-                    <td>{conflict.element_type}</td>
-                    <td>{conflict.element_name}</td>
-                    <td>{conflict.conflict_type}</td>
-                    <td>{conflict.resolution_strategy}</td>
-                    <td>{conflict.description}</td>
+                    <td>{_html(conflict.element_type)}</td>
+                    <td>{_html(conflict.element_name)}</td>
+                    <td>{_html(conflict.conflict_type)}</td>
+                    <td>{_html(conflict.resolution_strategy)}</td>
+                    <td>{_html(conflict.description)}</td>
                 </tr>
             """)
         
@@ -515,19 +599,19 @@ class ReportGenerator:
     
     def _create_warnings_section(self, warnings: List[str], errors: List[str]) -> str:
         """Erstellt eine HTML-Sektion für Warnungen und Fehler."""
-        content = ""
+        parts = []
         
         if errors:
-            content += "<h3 class='error'>Fehler:</h3><ul>"
-            content += ''.join(f'<li class="error">{error}</li>' for error in errors)
-            content += "</ul>"
+            parts.append("<h3 class='error'>Fehler:</h3><ul>")
+            parts.extend(f'<li class="error">{_html(error)}</li>' for error in errors)
+            parts.append("</ul>")
         
         if warnings:
-            content += "<h3 class='warning'>Warnungen:</h3><ul>"
-            content += ''.join(f'<li class="warning">{warning}</li>' for warning in warnings)
-            content += "</ul>"
+            parts.append("<h3 class='warning'>Warnungen:</h3><ul>")
+            parts.extend(f'<li class="warning">{_html(warning)}</li>' for warning in warnings)
+            parts.append("</ul>")
         
-        if not content:
-            content = "<p>Keine Warnungen oder Fehler.</p>"
+        if not parts:
+            return "<p>Keine Warnungen oder Fehler.</p>"
         
-        return content
+        return ''.join(parts)
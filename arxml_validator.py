@@ -5,18 +5,63 @@ Dieser Modul implementiert umfassende Validierungsfunktionen für ARXML-Dateien,
 einschließlich Schema-Validierung, Encoding-Detection und Strukturprüfung.
 """
 
-import xml.etree.ElementTree as ET
 from xml.dom import minidom
 import chardet
+import codecs
+import mmap
+import os
 import re
-from typing import List, Dict, Optional, Tuple, Set
-from dataclasses import dataclass
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, Set, FrozenSet, Any, Callable
+from dataclasses import dataclass, replace
 from enum import Enum
 import logging
 from pathlib import Path
 
+from utils import DATACLASS_SLOTS, strip_namespace
+
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Clark-Notation der häufig geprüften Tags im AUTOSAR-4-Namespace
+AUTOSAR_NS = '{http://autosar.org/schema/r4.0}'
+TAG_SHORT_NAME = AUTOSAR_NS + 'SHORT-NAME'
+TAG_AR_PACKAGE = AUTOSAR_NS + 'AR-PACKAGE'
+TAG_AR_PACKAGES = AUTOSAR_NS + 'AR-PACKAGES'
+XSI_SCHEMA_LOCATION = '{http://www.w3.org/2001/XMLSchema-instance}schemaLocation'
+
+# Vorberechnete Tag-Mengen (lokal, qualifiziert) für Dokumente im Standard-Namespace
+_AUTOSAR_TAG_SETS: Dict[str, FrozenSet[str]] = {
+    'SHORT-NAME': frozenset(('SHORT-NAME', TAG_SHORT_NAME)),
+    'AR-PACKAGE': frozenset(('AR-PACKAGE', TAG_AR_PACKAGE)),
+    'AR-PACKAGES': frozenset(('AR-PACKAGES', TAG_AR_PACKAGES)),
+}
+
+# Einmal kompilierte Muster für die Prüf- und Erkennungsschritte
+_SHORT_NAME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9_]*$')
+_AUTOSAR_VERSION_RE = re.compile(r'AUTOSAR_(\d+\.\d+\.\d+)')
+_XML_ENCODING_RE = re.compile(r'encoding=["\']([^"\']+)["\']')
+
+# Start-Tags (optional mit Präfix) für die Vorprüfung der Rohbytes
+_AUTOSAR_START_RE = re.compile(rb'<(?:[\w.-]+:)?AUTOSAR[\s>/]')
+_AR_PACKAGES_START_RE = re.compile(rb'<(?:[\w.-]+:)?AR-PACKAGES[\s>/]')
+
+
+def _count_elements(root: Any) -> int:
+    """Zählt alle Elemente eines Baums, ohne eine Liste aufzubauen."""
+    if LXML_AVAILABLE:
+        # Zählt in libxml2, ohne für jeden Knoten ein Python-Proxy-Objekt
+        return int(root.xpath('count(//*)'))
+    return sum(1 for _ in root.iter())
+
 
 class ValidationLevel(Enum):
     """Validierungsstufen."""
@@ -34,7 +79,7 @@ class ValidationSeverity(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ValidationIssue:
     """Repräsentiert ein Validierungsproblem."""
     severity: ValidationSeverity
@@ -48,6 +93,8 @@ class ValidationIssue:
 @dataclass
 class ValidationResult:
     """Ergebnis einer Validierung."""
+    __slots__ = ('is_valid', 'issues', 'encoding', 'autosar_version',
+                 'schema_version', 'element_count', 'file_size')
     is_valid: bool
     issues: List[ValidationIssue]
     encoding: Optional[str]
@@ -62,12 +109,45 @@ class EncodingDetector:
     
     SUPPORTED_ENCODINGS = ['utf-8', 'utf-16', 'iso-8859-1', 'windows-1252']
     
+    # Byte-Order-Marks; UTF-32 vor UTF-16 prüfen (gleiche Anfangsbytes)
+    _BOMS = (
+        (b'\xef\xbb\xbf', 'utf-8'),
+        (b'\xff\xfe\x00\x00', 'utf-32'),
+        (b'\x00\x00\xfe\xff', 'utf-32'),
+        (b'\xff\xfe', 'utf-16'),
+        (b'\xfe\xff', 'utf-16'),
+    )
+    
+    @staticmethod
+    def _encoding_from_header(head: bytes) -> Optional[str]:
+        """Bestimmt das Encoding aus BOM oder XML-Deklaration (None, falls unklar)."""
+        for bom, encoding in EncodingDetector._BOMS:
+            if head.startswith(bom):
+                return encoding
+        
+        if head.startswith(b'<?xml'):
+            end = head.find(b'?>')
+            if end != -1:
+                declaration = head[:end].decode('ascii', errors='ignore')
+                encoding_match = _XML_ENCODING_RE.search(declaration)
+                if encoding_match:
+                    return encoding_match.group(1).lower()
+                # Deklaration ohne encoding-Attribut: laut XML-Spezifikation UTF-8
+                return 'utf-8'
+        return None
+    
     @staticmethod
     def detect_encoding(file_path: str) -> Tuple[str, float]:
         """Erkennt das Encoding einer Datei."""
         try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read(10000)  # Lese ersten 10KB
+            # ARXML beginnt praktisch immer mit BOM oder XML-Deklaration:
+            # dann genügen wenige Bytes, chardet nur für uneindeutige Dateien
+            with open(file_path, 'rb', buffering=0) as f:
+                head = f.read(256)
+                encoding = EncodingDetector._encoding_from_header(head)
+                if encoding:
+                    return encoding, 1.0
+                raw_data = head + f.read(10000 - len(head))  # Lese ersten 10KB
             
             # Versuche chardet
             detection = chardet.detect(raw_data)
@@ -85,7 +165,7 @@ class EncodingDetector:
             
             # Fallback: Versuche XML-Header zu parsen
             xml_header = raw_data[:200].decode('utf-8', errors='ignore')
-            encoding_match = re.search(r'encoding=["\']([^"\']+)["\']', xml_header)
+            encoding_match = _XML_ENCODING_RE.search(xml_header)
             if encoding_match:
                 return encoding_match.group(1).lower(), 0.9
             
@@ -99,11 +179,16 @@ class EncodingDetector:
     @staticmethod
     def validate_encoding(file_path: str, expected_encoding: str) -> bool:
         """Validiert, ob eine Datei das erwartete Encoding hat."""
+        # Inkrementell in 64-KB-Blöcken dekodieren statt die ganze Datei als
+        # str zu laden; bricht beim ersten ungültigen Byte ab
+        decoder = codecs.getincrementaldecoder(expected_encoding)()
         try:
-            with open(file_path, 'r', encoding=expected_encoding) as f:
-                f.read()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(65536), b''):
+                    decoder.decode(chunk)
+            decoder.decode(b'', final=True)
             return True
-        except UnicodeDecodeError:
+        except UnicodeError:
             return False
 
 
@@ -115,42 +200,43 @@ class AutosarStructureValidator:
     REQUIRED_AUTOSAR_CHILDREN = ['AR-PACKAGES']
     
     # Bekannte AUTOSAR-Versionen
-    AUTOSAR_VERSIONS = {
+    AUTOSAR_VERSIONS = frozenset({
         '4.0.1', '4.0.2', '4.0.3',
         '4.1.1', '4.1.2', '4.1.3',
         '4.2.1', '4.2.2',
         '4.3.0', '4.3.1',
         '4.4.0', '4.5.0'
-    }
+    })
     
     def __init__(self):
         self.issues: List[ValidationIssue] = []
+        self._ns_prefix = ''
+        self._tag_sets: Dict[str, FrozenSet[str]] = {}
     
     def validate_structure(self, tree: ET.ElementTree) -> List[ValidationIssue]:
         """Validiert die AUTOSAR-Struktur eines XML-Baums."""
         self.issues = []
         root = tree.getroot()
         
+        # Namespace einmalig aus dem Root-Tag bestimmen ("{uri}" oder "")
+        root_tag = root.tag
+        self._ns_prefix = root_tag[:root_tag.index('}') + 1] if '}' in root_tag else ''
+        self._tag_sets = dict(_AUTOSAR_TAG_SETS) if self._ns_prefix == AUTOSAR_NS else {}
+        
         # Validiere Root-Element
         self._validate_root_element(root)
         
         # Validiere AUTOSAR-Version
         self._validate_autosar_version(root)
         
-        # Validiere Package-Struktur
-        self._validate_package_structure(root)
-        
-        # Validiere Short-Names
-        self._validate_short_names(root)
-        
-        # Validiere Referenzen
-        self._validate_references(root)
+        # Package-Struktur, Short-Names und Referenzen in einem Durchlauf
+        self._walk(root)
         
         return self.issues
     
     def _validate_root_element(self, root: ET.Element) -> None:
         """Validiert das Root-Element."""
-        root_tag = self._strip_namespace(root.tag)
+        root_tag = strip_namespace(root.tag)
         
         if root_tag not in self.REQUIRED_ROOT_ELEMENTS:
             self.issues.append(ValidationIssue(
@@ -163,13 +249,14 @@ class AutosarStructureValidator:
     def _validate_autosar_version(self, root: ET.Element) -> None:
         """Validiert die AUTOSAR-Version."""
         # Suche nach Schema-Location oder Version-Attributen
-        schema_location = root.get('{http://www.w3.org/2001/XMLSchema-instance}schemaLocation')
+        schema_location = root.get(XSI_SCHEMA_LOCATION)
         if schema_location:
-            # Extrahiere Version aus Schema-Location
-            version_match = re.search(r'AUTOSAR_(\d+\.\d+\.\d+)', schema_location)
-            if version_match:
-                version = version_match.group(1)
-                if version not in self.AUTOSAR_VERSIONS:
+            # Alle Versionen der Schema-Location in einem findall-Durchlauf;
+            # unbekannt ist, was nach der Mengendifferenz übrig bleibt
+            versions = _AUTOSAR_VERSION_RE.findall(schema_location)
+            unknown = set(versions) - self.AUTOSAR_VERSIONS
+            for version in dict.fromkeys(versions):
+                if version in unknown:
                     self.issues.append(ValidationIssue(
                         severity=ValidationSeverity.WARNING,
                         message=f"Unbekannte AUTOSAR-Version: {version}",
@@ -177,109 +264,164 @@ class AutosarStructureValidator:
                         suggestion=f"Unterstützte Versionen: {', '.join(sorted(self.AUTOSAR_VERSIONS))}"
                     ))
     
-    def _validate_package_structure(self, root: ET.Element) -> None:
-        """Validiert die AR-PACKAGES-Struktur."""
-        ar_packages = self._find_elements(root, 'AR-PACKAGES')
+    def _walk(self, root: ET.Element) -> None:
+        """Prüft Packages, SHORT-NAMEs und Referenzen in einem Baumdurchlauf.
+        
+        Tiefensuche mit explizitem Stack in Dokumentreihenfolge: jeder Eintrag
+        kennt Elternelement, umschließendes AR-PACKAGE und den Pfad seines
+        Elements, so dass Elementpfade ohne Rückwärtssuche entstehen. Die
+        Meldungen werden je Prüfung gesammelt und in der bisherigen
+        Reihenfolge (Packages, SHORT-NAMEs, Referenzen) angehängt.
+        """
+        sn_tag = self._ns_prefix + 'SHORT-NAME'
+        sn_tags = self._tags('SHORT-NAME')
+        package_tags = self._tags('AR-PACKAGE')
+        packages_tags = self._tags('AR-PACKAGES')
+        element_path = self._element_path
+        
+        package_issues: List[ValidationIssue] = []
+        short_name_issues: List[ValidationIssue] = []
+        # Bereits gesehene (Scope, Name)-Paare; Scope ist der nächste Vorfahre
+        # des definierenden Elements mit eigenem SHORT-NAME (Identifiable,
+        # z. B. AR-PACKAGE oder Interface), None auf oberster Ebene
+        short_names: Set[Tuple[Any, str]] = set()
+        definitions: Set[str] = set()
+        # Referenzen als parallele Listen (Ziel, Elementpfad) in Dokumentreihenfolge
+        ref_targets: List[str] = []
+        ref_paths: List[str] = []
+        # Package-Hierarchie: AR-PACKAGES -> [Pfad, Anzahl AR-PACKAGE], AR-PACKAGE -> Pfad
+        containers: Dict[Any, List[Any]] = {}
+        packages: Dict[Any, str] = {}
+        has_packages = False
+        
+        root_path = '/' + strip_namespace(root.tag)
+        text = root.text
+        if text and text[0] == '/':
+            ref_targets.append(text)
+            ref_paths.append(root_path)
+        
+        # Stack-Einträge: (Kind-Iterator, Element, Scope seines SHORT-NAME,
+        # Scope der SHORT-NAMEs seiner Kinder, Tag-Zähler seiner Kinder,
+        # Pfad des Elements)
+        stack = [(iter(root), root, None, None, {}, root_path)]
+        while stack:
+            children, parent, scope, child_scope, counts, parent_path = stack[-1]
+            for elem in children:
+                tag = elem.tag
+                index = counts[tag] = counts.get(tag, 0) + 1
+                path = None
+                
+                if tag in sn_tags:
+                    text = elem.text
+                    if text:
+                        if tag == sn_tag:
+                            key = (scope, text)
+                            if key in short_names:
+                                # Duplikat im gleichen Scope
+                                path = element_path(parent_path, tag, index)
+                                short_name_issues.append(ValidationIssue(
+                                    severity=ValidationSeverity.ERROR,
+                                    message=f"Doppelter SHORT-NAME im gleichen Scope: {text}",
+                                    element_path=path,
+                                    suggestion="SHORT-NAMEs müssen innerhalb ihres Scopes eindeutig sein."
+                                ))
+                            else:
+                                short_names.add(key)
+                        # Das Elternelement eines SHORT-NAME ist eine Definition
+                        autosar_path = self._get_autosar_path(parent)
+                        if autosar_path:
+                            definitions.add(autosar_path)
+                
+                elif tag in packages_tags:
+                    if parent is root:
+                        containers[elem] = ["/AUTOSAR/AR-PACKAGES", 0]
+                        has_packages = True
+                    elif parent in packages:
+                        containers[elem] = [f"{packages[parent]}/AR-PACKAGES", 0]
+                
+                elif tag in package_tags:
+                    container = containers.get(parent)
+                    if container is not None:
+                        container[1] += 1
+                        package_path = packages[elem] = f"{container[0]}/AR-PACKAGE[{container[1]}]"
+                        self._check_package_short_name(elem, package_path, package_issues)
+                
+                text = elem.text
+                if text and text[0] == '/':
+                    if path is None:
+                        path = element_path(parent_path, tag, index)
+                    ref_targets.append(text)
+                    ref_paths.append(path)
+                
+                if len(elem):
+                    if path is None:
+                        path = element_path(parent_path, tag, index)
+                    # SHORT-NAME steht laut Schema als erstes Kind: ein
+                    # Identifiable öffnet einen eigenen Namensraum
+                    stack.append((iter(elem), elem, child_scope,
+                                  elem if elem[0].tag in sn_tags else child_scope,
+                                  {}, path))
+                    break
+            else:
+                stack.pop()
         
-        if not ar_packages:
+        if not has_packages:
             self.issues.append(ValidationIssue(
                 severity=ValidationSeverity.ERROR,
                 message="Keine AR-PACKAGES gefunden",
                 element_path="/AUTOSAR",
                 suggestion="AUTOSAR-Dateien müssen mindestens ein AR-PACKAGES-Element enthalten."
             ))
-            return
-        
-        # Validiere Package-Hierarchie
-        for packages in ar_packages:
-            self._validate_packages_recursive(packages, "/AUTOSAR/AR-PACKAGES")
-    
-    def _validate_packages_recursive(self, packages_element: ET.Element, path: str) -> None:
-        """Validiert Package-Hierarchie rekursiv."""
-        ar_packages = self._find_elements(packages_element, 'AR-PACKAGE')
-        
-        for i, package in enumerate(ar_packages):
-            package_path = f"{path}/AR-PACKAGE[{i+1}]"
-            
-            # Validiere Short-Name
-            short_name = self._find_element_text(package, 'SHORT-NAME')
-            if not short_name:
-                self.issues.append(ValidationIssue(
-                    severity=ValidationSeverity.ERROR,
-                    message="AR-PACKAGE ohne SHORT-NAME",
-                    element_path=package_path,
-                    suggestion="Jedes AR-PACKAGE muss ein SHORT-NAME-Element haben."
-                ))
-            elif not self._is_valid_short_name(short_name):
-                self.issues.append(ValidationIssue(
-                    severity=ValidationSeverity.WARNING,
-                    message=f"Ungültiger SHORT-NAME: {short_name}",
-                    element_path=f"{package_path}/SHORT-NAME",
-                    suggestion="SHORT-NAME sollte nur alphanumerische Zeichen und Unterstriche enthalten."
-                ))
-            
-            # Rekursive Validierung von Unter-Packages
-            sub_packages = self._find_elements(package, 'AR-PACKAGES')
-            for sub_package in sub_packages:
-                self._validate_packages_recursive(sub_package, f"{package_path}/AR-PACKAGES")
-    
-    def _validate_short_names(self, root: ET.Element) -> None:
-        """Validiert alle SHORT-NAME-Elemente."""
-        short_names = {}
-        
-        for elem in root.iter():
-            if self._strip_namespace(elem.tag) == 'SHORT-NAME' and elem.text:
-                path = self._get_element_path(elem)
-                if elem.text in short_names:
-                    # Prüfe auf Duplikate im gleichen Scope
-                    existing_path = short_names[elem.text]
-                    if self._same_scope(path, existing_path):
-                        self.issues.append(ValidationIssue(
-                            severity=ValidationSeverity.ERROR,
-                            message=f"Doppelter SHORT-NAME im gleichen Scope: {elem.text}",
-                            element_path=path,
-                            suggestion="SHORT-NAMEs müssen innerhalb ihres Scopes eindeutig sein."
-                        ))
-                else:
-                    short_names[elem.text] = path
-    
-    def _validate_references(self, root: ET.Element) -> None:
-        """Validiert Referenzen zwischen Elementen."""
-        # Sammle alle definierten Elemente
-        definitions = set()
-        references = []
+        self.issues.extend(package_issues)
+        self.issues.extend(short_name_issues)
         
-        for elem in root.iter():
-            # Sammle Definitionen (Elemente mit SHORT-NAME)
-            short_name_elem = self._find_element(elem, 'SHORT-NAME')
-            if short_name_elem is not None and short_name_elem.text:
-                path = self._get_autosar_path(elem)
-                if path:
-                    definitions.add(path)
-            
-            # Sammle Referenzen
-            if elem.text and elem.text.startswith('/'):
-                references.append((elem.text, self._get_element_path(elem)))
-        
-        # Validiere Referenzen
-        for ref, ref_path in references:
-            if ref not in definitions:
-                self.issues.append(ValidationIssue(
+        # Validiere Referenzen: Mengendifferenz in C, Python-Schleife nur
+        # über die Referenzen, wenn überhaupt etwas unaufgelöst bleibt
+        unresolved = set(ref_targets)
+        unresolved.difference_update(definitions)
+        if unresolved:
+            self.issues.extend(
+                ValidationIssue(
                     severity=ValidationSeverity.WARNING,
                     message=f"Unaufgelöste Referenz: {ref}",
                     element_path=ref_path,
                     suggestion="Stellen Sie sicher, dass das referenzierte Element existiert."
-                ))
+                )
+                for ref, ref_path in zip(ref_targets, ref_paths)
+                if ref in unresolved
+            )
     
-    def _strip_namespace(self, tag: str) -> str:
-        """Entfernt Namespace-Präfix von einem Tag."""
-        if '}' in tag:
-            return tag.split('}', 1)[1]
-        return tag
+    def _check_package_short_name(self, package: ET.Element, package_path: str,
+                                  issues: List[ValidationIssue]) -> None:
+        """Prüft den SHORT-NAME eines AR-PACKAGE."""
+        short_name = self._find_element_text(package, 'SHORT-NAME')
+        if not short_name:
+            issues.append(ValidationIssue(
+                severity=ValidationSeverity.ERROR,
+                message="AR-PACKAGE ohne SHORT-NAME",
+                element_path=package_path,
+                suggestion="Jedes AR-PACKAGE muss ein SHORT-NAME-Element haben."
+            ))
+        elif not self._is_valid_short_name(short_name):
+            issues.append(ValidationIssue(
+                severity=ValidationSeverity.WARNING,
+                message=f"Ungültiger SHORT-NAME: {short_name}",
+                element_path=f"{package_path}/SHORT-NAME",
+                suggestion="SHORT-NAME sollte nur alphanumerische Zeichen und Unterstriche enthalten."
+            ))
+    
+    def _tags(self, tag: str) -> FrozenSet[str]:
+        """Liefert den Tag mit und ohne Namespace des aktuellen Dokuments."""
+        wanted = self._tag_sets.get(tag)
+        if wanted is None:
+            wanted = self._tag_sets[tag] = frozenset((tag, self._ns_prefix + tag))
+        return wanted
     
     def _find_elements(self, parent: ET.Element, tag: str) -> List[ET.Element]:
         """Findet alle direkten Kinder mit dem gegebenen Tag."""
-        return [child for child in parent if self._strip_namespace(child.tag) == tag]
+        # Tag mit und ohne Namespace: ein Hash-Lookup pro Kind statt split()
+        wanted = self._tags(tag)
+        return [child for child in parent if child.tag in wanted]
     
     def _find_element(self, parent: ET.Element, tag: str) -> Optional[ET.Element]:
         """Findet das erste direkte Kind mit dem gegebenen Tag."""
@@ -293,34 +435,199 @@ class AutosarStructureValidator:
     
     def _is_valid_short_name(self, name: str) -> bool:
         """Prüft, ob ein SHORT-NAME gültig ist."""
-        return bool(re.match(r'^[a-zA-Z][a-zA-Z0-9_]*$', name))
+        return _SHORT_NAME_RE.match(name) is not None
     
-    def _get_element_path(self, element: ET.Element) -> str:
-        """Erstellt einen XPath-ähnlichen Pfad für ein Element."""
-        # Vereinfachte Implementierung
-        return f"/{self._strip_namespace(element.tag)}"
+    @staticmethod
+    def _element_path(parent_path: str, tag: str, index: int) -> str:
+        """Erstellt einen XPath-ähnlichen Pfad aus Elternpfad, Tag und Position.
+        
+        index ist die Position unter den gleichnamigen Geschwistern; [1]
+        wird weggelassen.
+        """
+        name = strip_namespace(tag)
+        if index == 1:
+            return f"{parent_path}/{name}"
+        return f"{parent_path}/{name}[{index}]"
     
     def _get_autosar_path(self, element: ET.Element) -> Optional[str]:
         """Erstellt einen AUTOSAR-Pfad für ein Element."""
         # Vereinfachte Implementierung
         return None
     
-    def _same_scope(self, path1: str, path2: str) -> bool:
-        """Prüft, ob zwei Pfade im gleichen Scope sind."""
-        # Vereinfachte Implementierung
-        return path1.rsplit('/', 1)[0] == path2.rsplit('/', 1)[0]
+
+
+class _UncacheableResult(Exception):
+    """Trägt ein Ergebnis aus dem Cache heraus; lru_cache speichert keine Ausnahmen."""
+    
+    def __init__(self, result: 'ValidationResult'):
+        super().__init__()
+        self.result = result
+
+
+@lru_cache(maxsize=64)
+def _validate_file_cached(file_path: str, mtime_ns: int, size: int,
+                          validation_level: ValidationLevel,
+                          encoding_override: Optional[str]) -> 'ValidationResult':
+    """Validiert eine Datei; mtime_ns und size sind nur Teil des Cache-Schlüssels.
+    
+    Ändert sich die Datei, ändert sich der Schlüssel und sie wird neu validiert.
+    Ergebnisse unerwarteter Fehler (z. B. vorübergehende I/O-Fehler) werden
+    nicht gespeichert.
+    """
+    result, cacheable = ARXMLValidator(validation_level)._validate(file_path, encoding_override)
+    if not cacheable:
+        raise _UncacheableResult(result)
+    return result
+
+
+def _validate_one(file_path: str, validation_level: ValidationLevel,
+                  encoding_override: Optional[str] = None) -> 'ValidationResult':
+    """Validiert eine Datei in einem Worker-Prozess (muss picklebar auf Modulebene liegen)."""
+    return ARXMLValidator(validation_level).validate_file(file_path, encoding_override)
 
 
 class ARXMLValidator:
     """Hauptklasse für ARXML-Validierung."""
     
+    # Unterhalb dieser Schwellen kostet der Start der Worker-Prozesse (unter
+    # Windows per spawn, inkl. Modul-Import) mehr, als die Parallelität spart
+    PARALLEL_MIN_FILES = 16
+    PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+    
     def __init__(self, validation_level: ValidationLevel = ValidationLevel.STRUCTURE):
         self.validation_level = validation_level
         self.encoding_detector = EncodingDetector()
         self.structure_validator = AutosarStructureValidator()
+        # lxml-Parser sind nicht threadsicher: ein wiederverwendeter Parser pro Thread
+        self._local = threading.local()
+    
+    def _get_parser(self):
+        """Gibt den lxml-Parser des aktuellen Threads zurück (None ohne lxml)."""
+        if not LXML_AVAILABLE:
+            return None
+        parser = getattr(self._local, 'parser', None)
+        if parser is None:
+            # Kommentare und PIs verwirft auch ElementTree; der Validator
+            # sieht so unter beiden Backends denselben Baum
+            parser = self._local.parser = ET.XMLParser(
+                huge_tree=True,
+                collect_ids=False,
+                resolve_entities=False,
+                no_network=True,
+                remove_comments=True,
+                remove_pis=True
+            )
+        return parser
+    
+    def _count_elements_streaming(self, file_path: str) -> int:
+        """Parst eine Datei per iterparse und zählt die Elemente.
+        
+        Bereits vollständig gelesene Teilbäume werden geleert; der
+        Speicherbedarf hängt so nicht mehr von der Dateigröße ab.
+        """
+        if not LXML_AVAILABLE:
+            count = 0
+            for _, elem in ET.iterparse(file_path, events=('end',)):
+                count += 1
+                elem.clear()
+            return count
+        
+        # Ein Python-Event pro Element wäre unter lxml teurer als der ganze
+        # Parse; daher nur pro AR-PACKAGE anhalten und dessen Nachfahren in
+        # libxml2 zählen. Die geleerte Hülle zählt später der umgebende Baum.
+        context = ET.iterparse(file_path, events=('end',), tag='{*}AR-PACKAGE',
+                               huge_tree=True, resolve_entities=False, no_network=True)
+        count = 0
+        for _, package in context:
+            count += int(package.xpath('count(.//*)'))
+            package.clear(keep_tail=True)
+        return count + int(context.root.xpath('count(//*)'))
     
-    def validate_file(self, file_path: str) -> ValidationResult:
-        """Validiert eine ARXML-Datei."""
+    @staticmethod
+    def _prescan_sentinels(file_path: str, encoding: Optional[str]) -> List[ValidationIssue]:
+        """Sucht die AUTOSAR- und AR-PACKAGES-Start-Tags direkt in den Rohbytes.
+        
+        Die Datei wird per mmap durchsucht, ohne sie zu parsen. Nur für
+        ASCII-kompatible Encodings; leere Dateien bleiben dem Parser überlassen.
+        """
+        if encoding:
+            # Groß-/Kleinschreibung und Aliase vereinheitlichen ("UTF_16" -> "utf-16")
+            try:
+                encoding = codecs.lookup(encoding).name
+            except LookupError:
+                encoding = encoding.lower().replace('_', '-')
+            if encoding.startswith(('utf-16', 'utf-32')):
+                return []
+        
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                has_root = _AUTOSAR_START_RE.search(mm) is not None
+                has_packages = has_root and _AR_PACKAGES_START_RE.search(mm) is not None
+        
+        if not has_root:
+            return [ValidationIssue(
+                severity=ValidationSeverity.CRITICAL,
+                message="Kein AUTOSAR-Root-Element gefunden",
+                element_path="/",
+                suggestion="Stellen Sie sicher, dass die Datei ein gültiges AUTOSAR-Root-Element hat."
+            )]
+        if not has_packages:
+            return [ValidationIssue(
+                severity=ValidationSeverity.ERROR,
+                message="Keine AR-PACKAGES gefunden",
+                element_path="/AUTOSAR",
+                suggestion="AUTOSAR-Dateien müssen mindestens ein AR-PACKAGES-Element enthalten."
+            )]
+        return []
+    
+    def validate_file(self, file_path: str, encoding_override: Optional[str] = None) -> ValidationResult:
+        """Validiert eine ARXML-Datei.
+        
+        Unveränderte Dateien (gleicher Pfad, mtime und Größe) werden nicht
+        erneut geparst, sondern aus einem prozessweiten Cache beantwortet.
+        Mit encoding_override entfällt die Encoding-Erkennung; stattdessen
+        wird geprüft, ob sich die Datei damit dekodieren lässt.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return self._validate_file_uncached(file_path, encoding_override)
+        
+        try:
+            cached = _validate_file_cached(os.path.abspath(file_path), stat.st_mtime_ns,
+                                           stat.st_size, self.validation_level, encoding_override)
+        except _UncacheableResult as e:
+            return e.result
+        # Eigene Issue-Objekte je Aufrufer, damit der Cache-Eintrag unverändert bleibt
+        return replace(cached, issues=self._copy_issues(cached.issues))
+    
+    @staticmethod
+    def _copy_issues(issues: List[ValidationIssue]) -> List[ValidationIssue]:
+        """Kopiert Issues flach.
+        
+        Direkter Konstruktor statt replace(), das pro Objekt fields() auswertet.
+        """
+        return [
+            ValidationIssue(issue.severity, issue.message, issue.line_number,
+                            issue.column_number, issue.element_path, issue.suggestion)
+            for issue in issues
+        ]
+    
+    def _validate_file_uncached(self, file_path: str,
+                                encoding_override: Optional[str] = None) -> ValidationResult:
+        """Validiert eine ARXML-Datei ohne Cache."""
+        return self._validate(file_path, encoding_override)[0]
+    
+    def _validate(self, file_path: str,
+                  encoding_override: Optional[str] = None) -> Tuple[ValidationResult, bool]:
+        """Validiert eine ARXML-Datei.
+        
+        Gibt zusätzlich zurück, ob das Ergebnis zwischengespeichert werden darf;
+        das gilt nicht für Ergebnisse des allgemeinen Fehlerpfads.
+        """
+        cacheable = True
         issues = []
         file_size = 0
         element_count = 0
@@ -332,8 +639,23 @@ class ARXMLValidator:
             # Datei-Größe ermitteln
             file_size = Path(file_path).stat().st_size
             
-            # Encoding erkennen
-            encoding, confidence = self.encoding_detector.detect_encoding(file_path)
+            # Encoding erkennen, sofern der Aufrufer es nicht vorgibt
+            if encoding_override:
+                encoding, confidence = encoding_override, 1.0
+                issue = self._check_encoding_override(file_path, encoding)
+                if issue:
+                    issues.append(issue)
+                    return ValidationResult(
+                        is_valid=False,
+                        issues=issues,
+                        encoding=encoding,
+                        autosar_version=autosar_version,
+                        schema_version=schema_version,
+                        element_count=0,
+                        file_size=file_size
+                    ), cacheable
+            else:
+                encoding, confidence = self.encoding_detector.detect_encoding(file_path)
             if confidence < 0.8:
                 issues.append(ValidationIssue(
                     severity=ValidationSeverity.WARNING,
@@ -343,9 +665,28 @@ class ARXMLValidator:
             
             # XML parsen
             try:
-                tree = ET.parse(file_path)
-                root = tree.getroot()
-                element_count = len(list(root.iter()))
+                if self.validation_level == ValidationLevel.BASIC:
+                    # Fehlen AUTOSAR/AR-PACKAGES schon in den Rohbytes, ist die
+                    # Datei ungültig, ohne dass sie geparst werden muss
+                    sentinel_issues = self._prescan_sentinels(file_path, encoding)
+                    if sentinel_issues:
+                        issues.extend(sentinel_issues)
+                        return ValidationResult(
+                            is_valid=False,
+                            issues=issues,
+                            encoding=encoding,
+                            autosar_version=autosar_version,
+                            schema_version=schema_version,
+                            element_count=0,
+                            file_size=file_size
+                        ), cacheable
+                    
+                    # Nur Wohlgeformtheit: streamen, ohne den DOM aufzubauen
+                    tree = None
+                    element_count = self._count_elements_streaming(file_path)
+                else:
+                    tree = ET.parse(file_path, self._get_parser())
+                    element_count = _count_elements(tree.getroot())
                 
             except ET.ParseError as e:
                 issues.append(ValidationIssue(
@@ -362,7 +703,7 @@ class ARXMLValidator:
                     schema_version=schema_version,
                     element_count=0,
                     file_size=file_size
-                )
+                ), cacheable
             
             # Struktur-Validierung
             if self.validation_level in [ValidationLevel.STRUCTURE, ValidationLevel.SCHEMA, ValidationLevel.SEMANTIC]:
@@ -380,6 +721,7 @@ class ARXMLValidator:
                 pass
             
         except Exception as e:
+            cacheable = False
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.CRITICAL,
                 message=f"Unerwarteter Fehler: {e}",
@@ -397,4 +739,68 @@ class ARXMLValidator:
             schema_version=schema_version,
             element_count=element_count,
             file_size=file_size
-        )
+        ), cacheable
+    
+    def _check_encoding_override(self, file_path: str, encoding: str) -> Optional[ValidationIssue]:
+        """Prüft ein vom Aufrufer vorgegebenes Encoding gegen den Dateiinhalt."""
+        try:
+            decodable = self.encoding_detector.validate_encoding(file_path, encoding)
+        except LookupError:
+            return ValidationIssue(
+                severity=ValidationSeverity.CRITICAL,
+                message=f"Unbekanntes Encoding: {encoding}",
+                suggestion="Geben Sie ein von Python unterstütztes Encoding an."
+            )
+        if not decodable:
+            return ValidationIssue(
+                severity=ValidationSeverity.CRITICAL,
+                message=f"Datei lässt sich nicht als {encoding} dekodieren",
+                suggestion="Überprüfen Sie das angegebene Encoding oder lassen Sie es erkennen."
+            )
+        return None
+    
+    def validate_files(self, file_paths: List[str], workers: Optional[int] = None,
+                       encoding_override: Optional[str] = None,
+                       progress: Optional[Callable[[str], None]] = None) -> Dict[str, ValidationResult]:
+        """Validiert mehrere Dateien, ab einer Mindestmenge in einem Prozess-Pool.
+        
+        Parsen und Baumdurchlauf sind CPU-gebunden und halten den GIL,
+        daher Prozesse statt Threads. Das Ergebnis ist nach Eingabereihenfolge
+        geordnet. progress wird vor der Validierung jeder Datei aufgerufen
+        (im Pool beim Einreichen).
+        """
+        workers = min(len(file_paths), workers or os.cpu_count() or 1)
+        if workers <= 1 or not self._worth_process_pool(file_paths):
+            results = {}
+            for path in file_paths:
+                if progress:
+                    progress(path)
+                results[path] = self.validate_file(path, encoding_override)
+            return results
+        
+        if progress:
+            for path in file_paths:
+                progress(path)
+        
+        # Mehrere Dateien pro Auftrag, um den IPC-Aufwand zu amortisieren
+        chunksize = max(1, len(file_paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_validate_one, file_paths,
+                                   [self.validation_level] * len(file_paths),
+                                   [encoding_override] * len(file_paths),
+                                   chunksize=chunksize)
+            return dict(zip(file_paths, results))
+    
+    def _worth_process_pool(self, file_paths: List[str]) -> bool:
+        """Prüft, ob sich der Start eines Prozess-Pools für die Dateien lohnt."""
+        if len(file_paths) >= self.PARALLEL_MIN_FILES:
+            return True
+        total_size = 0
+        for path in file_paths:
+            try:
+                total_size += os.path.getsize(path)
+            except OSError:
+                continue
+            if total_size >= self.PARALLEL_MIN_BYTES:
+                return True
+        return False
@@ -8,14 +8,23 @@ für den ARXML-Merger.
 import json
 import os
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import logging
 
+from utils import DATACLASS_SLOTS, dataclass_field_names, shallow_asdict
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MergeConfig:
     """Konfiguration für Merge-Vorgänge."""
     strategy: str = "conservative"
@@ -30,7 +39,7 @@ class MergeConfig:
     preserve_comments: bool = True
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ValidationConfig:
     """Konfiguration für Validierung."""
     check_schema: bool = True
@@ -45,7 +54,7 @@ class ValidationConfig:
             self.autosar_versions = ["4.2.1", "4.3.0", "4.4.0", "4.5.0"]
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ReportConfig:
     """Konfiguration für Berichtserstellung."""
     generate_html: bool = True
@@ -58,7 +67,7 @@ class ReportConfig:
     template_path: Optional[str] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class WebConfig:
     """Konfiguration für Web-Interface."""
     host: str = "localhost"
@@ -70,7 +79,7 @@ class WebConfig:
     static_files_path: str = "static"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PerformanceConfig:
     """Konfiguration für Performance-Optimierung."""
     max_memory_usage_mb: int = 1024
@@ -84,6 +93,9 @@ class PerformanceConfig:
 @dataclass
 class ARXMLMergerConfig:
     """Hauptkonfiguration für ARXML-Merger."""
+    # Felder ohne Defaults: explizite __slots__ gehen auch vor Python 3.10
+    __slots__ = ('merge', 'validation', 'reporting', 'web', 'performance')
+
     merge: MergeConfig
     validation: ValidationConfig
     reporting: ReportConfig
@@ -112,8 +124,13 @@ class ConfigManager:
         """Lädt Konfiguration aus Datei."""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
+                if ORJSON_AVAILABLE:
+                    # orjson liest UTF-8-Bytes direkt, ohne Text-Dekodierung
+                    with open(self.config_file, 'rb') as f:
+                        config_data = orjson.loads(f.read())
+                else:
+                    with open(self.config_file, 'r', encoding='utf-8') as f:
+                        config_data = json.load(f)
                 
                 # Lade Merge-Konfiguration
                 if 'merge' in config_data:
@@ -145,8 +162,10 @@ class ConfigManager:
     
     def _update_dataclass(self, target_obj: Any, source_dict: Dict[str, Any]) -> None:
         """Aktualisiert ein Dataclass-Objekt mit Werten aus einem Dictionary."""
+        # Nur echte Felder: hasattr() ließe auch Methoden wie __post_init__ zu
+        allowed = dataclass_field_names(type(target_obj))
         for key, value in source_dict.items():
-            if hasattr(target_obj, key):
+            if key in allowed:
                 setattr(target_obj, key, value)
             else:
                 logger.warning(f"Unbekannte Konfigurationsoption: {key}")
@@ -155,15 +174,19 @@ class ConfigManager:
         """Speichert aktuelle Konfiguration in Datei."""
         try:
             config_dict = {
-                'merge': asdict(self.config.merge),
-                'validation': asdict(self.config.validation),
-                'reporting': asdict(self.config.reporting),
-                'web': asdict(self.config.web),
-                'performance': asdict(self.config.performance)
+                'merge': shallow_asdict(self.config.merge),
+                'validation': shallow_asdict(self.config.validation),
+                'reporting': shallow_asdict(self.config.reporting),
+                'web': shallow_asdict(self.config.web),
+                'performance': shallow_asdict(self.config.performance)
             }
             
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_dict, f, indent=2, ensure_ascii=False)
+            if ORJSON_AVAILABLE:
+                with open(self.config_file, 'wb') as f:
+                    f.write(orjson.dumps(config_dict, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.config_file, 'w', encoding='utf-8') as f:
+                    json.dump(config_dict, f, indent=2, ensure_ascii=False)
             
             logger.info(f"Konfiguration gespeichert in: {self.config_file}")
             
@@ -217,43 +240,37 @@ class ConfigManager:
             logger.info(f"Konfigurationsdatei existiert bereits: {self.config_file}")
 
 
+def _parse_bool(value: str) -> bool:
+    """Wertet einen Schalter aus einer Umgebungsvariable aus."""
+    return value.lower() in ('true', '1', 'yes')
+
+
+# Umgebungsvariable -> (Abschnitt, Feld, Umwandlung)
+_ENV_MAP = (
+    ('ARXML_MERGER_HOST', 'web', 'host', str),
+    ('ARXML_MERGER_PORT', 'web', 'port', int),
+    ('ARXML_MERGER_DEBUG', 'web', 'debug_mode', _parse_bool),
+    ('ARXML_MERGER_MAX_MEMORY', 'performance', 'max_memory_usage_mb', int),
+    ('ARXML_MERGER_STRATEGY', 'merge', 'strategy', str),
+)
+
+
 class EnvironmentConfig:
     """Verwaltet Umgebungsvariablen für ARXML-Merger."""
     
     @staticmethod
     def get_config_from_env() -> Dict[str, Any]:
         """Lädt Konfiguration aus Umgebungsvariablen."""
-        config = {}
-        
-        # Web-Konfiguration
-        if 'ARXML_MERGER_HOST' in os.environ:
-            config['web'] = config.get('web', {})
-            config['web']['host'] = os.environ['ARXML_MERGER_HOST']
-        
-        if 'ARXML_MERGER_PORT' in os.environ:
-            config['web'] = config.get('web', {})
-            try:
-                config['web']['port'] = int(os.environ['ARXML_MERGER_PORT'])
-            except ValueError:
-                logger.warning("Ungültiger Port in ARXML_MERGER_PORT")
-        
-        # Debug-Modus
-        if 'ARXML_MERGER_DEBUG' in os.environ:
-            config['web'] = config.get('web', {})
-            config['web']['debug_mode'] = os.environ['ARXML_MERGER_DEBUG'].lower() in ['true', '1', 'yes']
+        config: Dict[str, Dict[str, Any]] = {}
         
-        # Performance-Konfiguration
-        if 'ARXML_MERGER_MAX_MEMORY' in os.environ:
-            config['performance'] = config.get('performance', {})
+        for env_key, section, field, caster in _ENV_MAP:
+            value = os.environ.get(env_key)
+            if value is None:
+                continue
             try:
-                config['performance']['max_memory_usage_mb'] = int(os.environ['ARXML_MERGER_MAX_MEMORY'])
+                config.setdefault(section, {})[field] = caster(value)
             except ValueError:
-                logger.warning("Ungültiger Wert in ARXML_MERGER_MAX_MEMORY")
-        
-        # Merge-Strategie
-        if 'ARXML_MERGER_STRATEGY' in os.environ:
-            config['merge'] = config.get('merge', {})
-            config['merge']['strategy'] = os.environ['ARXML_MERGER_STRATEGY']
+                logger.warning(f"Ungültiger Wert in {env_key}")
         
         return config
     
@@ -262,34 +279,27 @@ class EnvironmentConfig:
         """Wendet Umgebungsvariablen auf ConfigManager an."""
         env_config = EnvironmentConfig.get_config_from_env()
         
-        if 'web' in env_config:
-            config_manager._update_dataclass(config_manager.config.web, env_config['web'])
-        
-        if 'performance' in env_config:
-            config_manager._update_dataclass(config_manager.config.performance, env_config['performance'])
-        
-        if 'merge' in env_config:
-            config_manager._update_dataclass(config_manager.config.merge, env_config['merge'])
+        for section, values in env_config.items():
+            config_manager._update_dataclass(getattr(config_manager.config, section), values)
         
         logger.info("Umgebungsvariablen angewendet")
 
 
-# Globale Konfigurationsinstanz
-_global_config_manager = None
+# Globale Konfigurationsinstanz je Konfigurationsdatei; lru_cache macht den
+# wiederholten Zugriff zu einem Dictionary-Lookup in C
+@lru_cache(maxsize=None)
+def _build_config_manager(config_file: Optional[str]) -> ConfigManager:
+    """Erstellt einen ConfigManager und wendet die Umgebungsvariablen an."""
+    config_manager = ConfigManager(config_file)
+    EnvironmentConfig.apply_env_config(config_manager)
+    return config_manager
 
 
 def get_config_manager(config_file: Optional[str] = None) -> ConfigManager:
-    """Gibt die globale ConfigManager-Instanz zurück."""
-    global _global_config_manager
-    
-    if _global_config_manager is None:
-        _global_config_manager = ConfigManager(config_file)
-        EnvironmentConfig.apply_env_config(_global_config_manager)
-    
-    return _global_config_manager
+    """Gibt die globale ConfigManager-Instanz für die Konfigurationsdatei zurück."""
+    return _build_config_manager(config_file)
 
 
 def reset_config_manager() -> None:
-    """Setzt die globale ConfigManager-Instanz zurück."""
-    global _global_config_manager
-    _global_config_manager = None
+    """Setzt die globalen ConfigManager-Instanzen zurück."""
+    _build_config_manager.cache_clear()
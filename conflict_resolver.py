@@ -76,12 +76,26 @@ class RuleEngine:
     def __init__(self):
         self.rules: List[ConflictRule] = []
         self.custom_handlers: Dict[str, Callable] = {}
+        # Kandidaten je (Element-Typ, Konflikt-Typ); Regeln daher nur über
+        # add_rule/remove_rule ändern, die den Cache leeren
+        self._rule_cache: Dict[Tuple[str, ConflictType], Tuple[ConflictRule, ...]] = {}
         self._load_default_rules()
     
+    def add_rule(self, rule: ConflictRule) -> None:
+        """Fügt eine Regel hinzu und hält die Liste nach Priorität sortiert."""
+        self.rules.append(rule)
+        self.rules.sort(key=lambda r: r.priority, reverse=True)
+        self._rule_cache.clear()
+    
+    def remove_rule(self, rule: ConflictRule) -> None:
+        """Entfernt eine Regel."""
+        self.rules.remove(rule)
+        self._rule_cache.clear()
+    
     def _load_default_rules(self) -> None:
         """Lädt Standard-Konfliktauflösungsregeln."""
         # Signale: Erste Datei hat Priorität
-        self.rules.append(ConflictRule(
+        self.add_rule(ConflictRule(
             element_type="I-SIGNAL",
             conflict_type=ConflictType.DUPLICATE_ELEMENT,
             resolution_strategy=ResolutionStrategy.KEEP_FIRST,
@@ -89,7 +103,7 @@ class RuleEngine:
         ))
         
         # Interfaces: Merge Attribute
-        self.rules.append(ConflictRule(
+        self.add_rule(ConflictRule(
             element_type="SENDER-RECEIVER-INTERFACE",
             conflict_type=ConflictType.DIFFERENT_ATTRIBUTES,
             resolution_strategy=ResolutionStrategy.MERGE_ATTRIBUTES,
@@ -97,7 +111,7 @@ class RuleEngine:
         ))
         
         # Datentypen: Letzte Datei gewinnt
-        self.rules.append(ConflictRule(
+        self.add_rule(ConflictRule(
             element_type="PRIMITIVE-TYPE",
             conflict_type=ConflictType.DUPLICATE_ELEMENT,
             resolution_strategy=ResolutionStrategy.KEEP_LAST,
@@ -105,7 +119,7 @@ class RuleEngine:
         ))
         
         # ECU-Instanzen: Benutzer-Entscheidung
-        self.rules.append(ConflictRule(
+        self.add_rule(ConflictRule(
             element_type="ECU-INSTANCE",
             conflict_type=ConflictType.DUPLICATE_ELEMENT,
             resolution_strategy=ResolutionStrategy.USER_CHOICE,
@@ -127,10 +141,7 @@ class RuleEngine:
                     conditions=rule_data.get('conditions'),
                     custom_handler=rule_data.get('custom_handler')
                 )
-                self.rules.append(rule)
-            
-            # Sortiere nach Priorität
-            self.rules.sort(key=lambda r: r.priority, reverse=True)
+                self.add_rule(rule)
             
             logger.info(f"Geladen: {len(rules_data.get('rules', []))} Regeln aus {rules_file}")
             
@@ -141,18 +152,28 @@ class RuleEngine:
         """Findet die passende Regel für einen Konflikt."""
         element_type = self._get_element_type(context.element1)
         
-        for rule in self.rules:
-            if (rule.element_type == element_type or rule.element_type == "*") and \
-               rule.conflict_type == context.conflict_type:
-                
-                # Prüfe zusätzliche Bedingungen
-                if rule.conditions and not self._check_conditions(rule.conditions, context):
-                    continue
-                
-                return rule
+        for rule in self._candidate_rules(element_type, context.conflict_type):
+            # Prüfe zusätzliche Bedingungen
+            if rule.conditions and not self._check_conditions(rule.conditions, context):
+                continue
+            
+            return rule
         
         return None
     
+    def _candidate_rules(self, element_type: str, conflict_type: ConflictType) -> Tuple[ConflictRule, ...]:
+        """Liefert die passenden Regeln in Prioritätsreihenfolge (gecacht)."""
+        key = (element_type, conflict_type)
+        candidates = self._rule_cache.get(key)
+        if candidates is None:
+            candidates = tuple(
+                rule for rule in self.rules
+                if rule.conflict_type == conflict_type
+                and (rule.element_type == element_type or rule.element_type == "*")
+            )
+            self._rule_cache[key] = candidates
+        return candidates
+    
     def _get_element_type(self, element: ET.Element) -> str:
         """Extrahiert den AUTOSAR-Element-Typ."""
         tag = element.tag
@@ -434,7 +455,9 @@ class ConflictResolver:
         # Speichere Auflösung für Berichterstattung
         self.resolved_conflicts.append((context, resolution))
         
-        logger.info(f"Konflikt aufgelöst: {context.element_path} -> {resolution.strategy_used.value}")
+        # Pro Konflikt nur auf DEBUG und lazy formatiert: bei vielen Konflikten
+        # kostet die Ausgabe sonst mehr als die Auflösung selbst
+        logger.debug("Konflikt aufgelöst: %s -> %s", context.element_path, resolution.strategy_used.value)
         
         return resolution
     
@@ -7,8 +7,10 @@ für den robusten ARXML-Merger.
 """
 
 import sys
+import os
 import argparse
 import logging
+import multiprocessing
 from pathlib import Path
 from typing import List, Optional
 
@@ -18,7 +20,6 @@ from conflict_resolver import ConflictResolver, ResolutionStrategy
 from arxml_reporter import ReportGenerator
 from config import get_config_manager
 from utils import setup_logging, performance_monitor, TempFileManager
-from web_interface import ARXMLWebServer
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
@@ -120,6 +121,11 @@ Beispiele:
         type=str,
         help='Verzeichnis für Ausgabedateien und Berichte'
     )
+    merge_parser.add_argument(
+        '--strip-whitespace',
+        action='store_true',
+        help='Verwirft Leerraum-Textknoten beim Parsen (spart Speicher, nicht byte-identisch)'
+    )
     
     # Web Command
     web_parser = subparsers.add_parser('web', help='Web-Interface starten')
@@ -159,6 +165,11 @@ Beispiele:
         type=str,
         help='Pfad für Validierungsbericht'
     )
+    validate_parser.add_argument(
+        '--encoding',
+        type=str,
+        help='Bekanntes Datei-Encoding (z. B. utf-8); überspringt die Erkennung und prüft die Datei dagegen'
+    )
     
     # Config Command
     config_parser = subparsers.add_parser('config', help='Konfiguration verwalten')
@@ -204,6 +215,12 @@ def handle_merge_command(args) -> int:
         # Lade Konfiguration
         config_manager = get_config_manager(args.config)
         
+        # Doppelt angegebene Dateien nur einmal mergen (Reihenfolge bleibt erhalten)
+        unique_inputs = list(dict.fromkeys(args.inputs))
+        if len(unique_inputs) != len(args.inputs):
+            logger.warning("Doppelt angegebene Eingabedateien werden ignoriert")
+            args.inputs = unique_inputs
+        
         # Validiere Eingabedateien
         for input_file in args.inputs:
             if not Path(input_file).exists():
@@ -220,7 +237,13 @@ def handle_merge_command(args) -> int:
         with performance_monitor() as monitor:
             # Initialisiere Merger
             strategy = MergeStrategy(args.strategy)
-            merger = ARXMLMergerEngine(strategy)
+            merge_config = config_manager.get_merge_config()
+            workers = config_manager.get_performance_config().parallel_workers if merge_config.parallel_processing else 1
+            merger = ARXMLMergerEngine(
+                strategy,
+                strip_whitespace=args.strip_whitespace,
+                max_workers=workers
+            )
             
             # Lade Konfliktauflösungsregeln falls vorhanden
             if args.rules:
@@ -258,6 +281,14 @@ def handle_merge_command(args) -> int:
         return 1
 
 
+def _file_size(file_path: str) -> int:
+    """Gibt die Dateigröße mit einem einzigen stat() zurück (0, falls nicht vorhanden)."""
+    try:
+        return os.stat(file_path).st_size
+    except OSError:
+        return 0
+
+
 def generate_reports(merge_result, args, config_manager) -> None:
     """Generiert Berichte für das Merge-Ergebnis."""
     logger = logging.getLogger(__name__)
@@ -283,8 +314,8 @@ def generate_reports(merge_result, args, config_manager) -> None:
             writing_time=0,
             memory_peak_usage=merge_result.memory_usage,
             input_files_count=len(args.inputs),
-            total_input_size=sum(Path(f).stat().st_size for f in args.inputs if Path(f).exists()),
-            output_size=Path(args.output).stat().st_size if Path(args.output).exists() else 0,
+            total_input_size=sum(_file_size(f) for f in args.inputs),
+            output_size=_file_size(args.output),
             elements_processed=0
         )
         
@@ -330,7 +361,8 @@ def handle_web_command(args) -> int:
         if args.debug:
             web_config.debug_mode = args.debug
         
-        # Starte Web-Server
+        # Starte Web-Server (http.server nur für dieses Kommando importieren)
+        from web_interface import ARXMLWebServer
         server = ARXMLWebServer(port=web_config.port, host=web_config.host)
         server.start()
         
@@ -355,14 +387,23 @@ def handle_validate_command(args) -> int:
         all_valid = True
         results = []
         
+        existing_files = []
         for input_file in args.inputs:
             if not Path(input_file).exists():
                 logger.error(f"Datei nicht gefunden: {input_file}")
                 all_valid = False
                 continue
-            
-            logger.info(f"Validiere: {input_file}")
-            result = validator.validate_file(input_file)
+            existing_files.append(input_file)
+        
+        # Große Eingabemengen werden parallel in einem Prozess-Pool validiert
+        validation_results = validator.validate_files(
+            existing_files,
+            encoding_override=args.encoding,
+            progress=lambda path: logger.info(f"Validiere: {path}")
+        )
+        
+        for input_file in existing_files:
+            result = validation_results[input_file]
             results.append((input_file, result))
             
             if result.is_valid:
@@ -520,4 +561,7 @@ def main() -> int:
 
 
 if __name__ == '__main__':
+    # Prozess-Pool der Validierung: ohne Wirkung, solange main.py nicht als
+    # Windows-Executable eingefroren wird (ARXML_Merger.spec baut es nicht)
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Tests für den ARXML-Merger-Engine.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arxml_merger_engine import ARXMLMergerEngine, MergeStrategy, ET
+
+AUTOSAR_NS = 'http://autosar.org/schema/r4.0'
+
+BASE_ARXML = f'''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="{AUTOSAR_NS}">
+  <AR-PACKAGES>
+    <AR-PACKAGE>
+      <SHORT-NAME>Root</SHORT-NAME>
+      <AR-PACKAGES>
+        <AR-PACKAGE>
+          <SHORT-NAME>Sub</SHORT-NAME>
+        </AR-PACKAGE>
+      </AR-PACKAGES>
+    </AR-PACKAGE>
+  </AR-PACKAGES>
+</AUTOSAR>
+'''
+
+SECOND_ARXML = f'''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="{AUTOSAR_NS}">
+  <AR-PACKAGES>
+    <AR-PACKAGE>
+      <SHORT-NAME>Root</SHORT-NAME>
+      <ELEMENTS>
+        <I-SIGNAL>
+          <SHORT-NAME>Sig1</SHORT-NAME>
+        </I-SIGNAL>
+      </ELEMENTS>
+    </AR-PACKAGE>
+  </AR-PACKAGES>
+</AUTOSAR>
+'''
+
+
+def _package_arxml(package: str, *signals: str) -> str:
+    """Erstellt eine ARXML-Datei mit einem AR-PACKAGE und I-SIGNALs."""
+    elements = ''.join(
+        f'<I-SIGNAL><SHORT-NAME>{name}</SHORT-NAME></I-SIGNAL>' for name in signals
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<AUTOSAR xmlns="{AUTOSAR_NS}"><AR-PACKAGES><AR-PACKAGE>'
+            f'<SHORT-NAME>{package}</SHORT-NAME><ELEMENTS>{elements}</ELEMENTS>'
+            f'</AR-PACKAGE></AR-PACKAGES></AUTOSAR>')
+
+
+class MergePackageContentTest(unittest.TestCase):
+    """Tests für das Zusammenführen gleichnamiger AR-PACKAGEs."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _write(self, name: str, content: str) -> str:
+        path = os.path.join(self._tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_elements_inserted_before_sub_packages(self):
+        """ELEMENTS muss im Basis-Paket vor AR-PACKAGES landen (AUTOSAR-Schema)."""
+        base = self._write('base.arxml', BASE_ARXML)
+        second = self._write('second.arxml', SECOND_ARXML)
+        output = os.path.join(self._tmp.name, 'merged.arxml')
+
+        result = ARXMLMergerEngine().merge_files([base, second], output)
+        self.assertTrue(result.success, result.errors)
+
+        root = ET.parse(output).getroot()
+        package = root.find(f'{{{AUTOSAR_NS}}}AR-PACKAGES/{{{AUTOSAR_NS}}}AR-PACKAGE')
+        child_tags = [child.tag.split('}')[-1] for child in package
+                      if isinstance(child.tag, str)]
+        self.assertEqual(child_tags, ['SHORT-NAME', 'ELEMENTS', 'AR-PACKAGES'])
+
+    def _conflict_sources(self, strategy: MergeStrategy, *contents: str):
+        """Führt die Inhalte als a/b/c.arxml zusammen und liefert die Konfliktquellen."""
+        paths = [self._write(f'{name}.arxml', content)
+                 for name, content in zip('abc', contents)]
+        result = ARXMLMergerEngine(strategy).merge_files(paths)
+        self.assertTrue(result.success, result.errors)
+        return [(c.element_name,
+                 os.path.basename(c.source_file_1),
+                 os.path.basename(c.source_file_2)) for c in result.conflicts]
+
+    def test_conflict_names_file_of_appended_element(self):
+        """Ein aus b übernommenes Element wird bei Konflikten b zugeordnet."""
+        conflicts = self._conflict_sources(
+            MergeStrategy.CONSERVATIVE,
+            _package_arxml('Root', 'S1'),
+            _package_arxml('Root', 'S1', 'S3'),
+            _package_arxml('Root', 'S3'),
+        )
+        self.assertEqual(conflicts, [('S1', 'a.arxml', 'b.arxml'),
+                                     ('S3', 'b.arxml', 'c.arxml')])
+
+    def test_conflict_names_file_of_appended_package(self):
+        """Elemente eines ganz aus b übernommenen Pakets stammen aus b."""
+        conflicts = self._conflict_sources(
+            MergeStrategy.CONSERVATIVE,
+            _package_arxml('Root', 'S1'),
+            _package_arxml('Other', 'S2'),
+            _package_arxml('Other', 'S2'),
+        )
+        self.assertEqual(conflicts, [('S2', 'b.arxml', 'c.arxml')])
+
+    def test_conflict_names_file_of_latest_replacement(self):
+        """Nach LATEST_WINS gehört das Element der ersetzenden Datei."""
+        conflicts = self._conflict_sources(
+            MergeStrategy.LATEST_WINS,
+            _package_arxml('Root', 'S1'),
+            _package_arxml('Root', 'S1'),
+            _package_arxml('Root', 'S1'),
+        )
+        self.assertEqual(conflicts, [('S1', 'a.arxml', 'b.arxml'),
+                                     ('S1', 'b.arxml', 'c.arxml')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests für den ARXML-Validator.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arxml_validator import AutosarStructureValidator, ET
+
+AUTOSAR_NS = 'http://autosar.org/schema/r4.0'
+
+
+def _interface(name: str, *data_elements: str) -> str:
+    """Erstellt ein SENDER-RECEIVER-INTERFACE mit DATA-ELEMENTS."""
+    prototypes = ''.join(
+        f'<VARIABLE-DATA-PROTOTYPE><SHORT-NAME>{element}</SHORT-NAME></VARIABLE-DATA-PROTOTYPE>'
+        for element in data_elements
+    )
+    return (f'<SENDER-RECEIVER-INTERFACE><SHORT-NAME>{name}</SHORT-NAME>'
+            f'<DATA-ELEMENTS>{prototypes}</DATA-ELEMENTS></SENDER-RECEIVER-INTERFACE>')
+
+
+def _document(*elements: str) -> ET.ElementTree:
+    """Erstellt ein AUTOSAR-Dokument mit einem Paket und den gegebenen Elementen."""
+    xml = (f'<AUTOSAR xmlns="{AUTOSAR_NS}"><AR-PACKAGES><AR-PACKAGE>'
+           f'<SHORT-NAME>Pkg</SHORT-NAME><ELEMENTS>{"".join(elements)}</ELEMENTS>'
+           f'</AR-PACKAGE></AR-PACKAGES></AUTOSAR>')
+    return ET.ElementTree(ET.fromstring(xml))
+
+
+class DuplicateShortNameTest(unittest.TestCase):
+    """Tests für die Prüfung doppelter SHORT-NAMEs."""
+
+    def _duplicates(self, tree: ET.ElementTree):
+        issues = AutosarStructureValidator().validate_structure(tree)
+        return [issue.message for issue in issues if 'Doppelter SHORT-NAME' in issue.message]
+
+    def test_same_name_in_different_interfaces_is_valid(self):
+        """Jedes Interface ist ein eigener Namensraum für seine DATA-ELEMENTS."""
+        tree = _document(_interface('If1', 'D'), _interface('If2', 'D'))
+        self.assertEqual(self._duplicates(tree), [])
+
+    def test_same_name_in_one_interface_is_reported(self):
+        """Doppelte DATA-ELEMENTS im selben Interface bleiben ein Fehler."""
+        tree = _document(_interface('If1', 'D', 'D'))
+        self.assertEqual(self._duplicates(tree), ['Doppelter SHORT-NAME im gleichen Scope: D'])
+
+    def test_same_name_in_one_package_is_reported(self):
+        """Zwei Elemente gleichen Namens im selben Paket sind ein Fehler."""
+        tree = _document(_interface('If1'), _interface('If1'))
+        self.assertEqual(self._duplicates(tree), ['Doppelter SHORT-NAME im gleichen Scope: If1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
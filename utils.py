@@ -6,6 +6,7 @@ für den ARXML-Merger.
 """
 
 import os
+import sys
 import time
 import hashlib
 import tempfile
@@ -17,9 +18,41 @@ import logging
 import psutil
 import threading
 from contextlib import contextmanager
+from dataclasses import fields
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) gibt es erst ab Python 3.10; explizite __slots__
+# vertragen sich nicht mit Feld-Defaults
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@lru_cache(maxsize=512)
+def strip_namespace(tag: Any) -> str:
+    """Entfernt Namespace-Präfix von einem XML-Tag.
+    
+    Ein Dokument enthält nur wenige verschiedene Tags; das Ergebnis wird
+    daher pro Tag nur einmal berechnet. lxml liefert für Kommentare und
+    Processing Instructions eine Funktion als Tag, dafür gibt es ''.
+    """
+    if not isinstance(tag, str):
+        return ''
+    if '}' in tag:
+        return tag.split('}', 1)[1]
+    return tag
+
+
+@lru_cache(maxsize=None)
+def dataclass_field_names(cls: type) -> Tuple[str, ...]:
+    """Feldnamen einer Dataclass in Deklarationsreihenfolge, einmal pro Klasse."""
+    return tuple(f.name for f in fields(cls))
+
+
+def shallow_asdict(obj: Any) -> Dict[str, Any]:
+    """Flaches Gegenstück zu asdict(): übernimmt Feldwerte ohne Deepcopy."""
+    return {name: getattr(obj, name) for name in dataclass_field_names(type(obj))}
+
 
 class PerformanceMonitor:
     """Überwacht Performance-Metriken während der Verarbeitung."""
@@ -215,12 +248,7 @@ class FileUtils:
 class XMLUtils:
     """Utility-Funktionen für XML-Verarbeitung."""
     
-    @staticmethod
-    def strip_namespace(tag: str) -> str:
-        """Entfernt Namespace-Präfix von einem XML-Tag."""
-        if '}' in tag:
-            return tag.split('}', 1)[1]
-        return tag
+    strip_namespace = staticmethod(strip_namespace)
     
     @staticmethod
     def get_namespace(tag: str) -> Optional[str]:
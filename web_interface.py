@@ -18,13 +18,14 @@ from urllib.parse import parse_qs, urlparse
 import logging
 from pathlib import Path
 
-from arxml_merger_engine import ARXMLMergerEngine, MergeStrategy
-from arxml_validator import ARXMLValidator, ValidationLevel
-from conflict_resolver import ConflictResolver, ResolutionStrategy
-from arxml_reporter import ReportGenerator, PerformanceMetrics
+# Merger und Reporter (lxml, chardet, ...) werden erst im Merge-Thread
+# importiert: die Oberfläche ist so ohne diese Importe erreichbar
 
 logger = logging.getLogger(__name__)
 
+# Blockgröße für das Schreiben von Uploads auf die Platte
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 
 class MergeSession:
     """Repräsentiert eine Merge-Session."""
@@ -32,6 +33,8 @@ class MergeSession:
     def __init__(self, session_id: str):
         self.session_id = session_id
         self.uploaded_files: List[str] = []
+        # Größe wird beim Upload festgehalten, damit Berichte kein stat() brauchen
+        self.uploaded_bytes = 0
         self.temp_dir = tempfile.mkdtemp(prefix=f"arxml_merge_{session_id}_")
         self.status = "initialized"
         self.progress = 0
@@ -82,7 +85,8 @@ class SessionManager:
                 current_time = time.time()
                 old_sessions = []
 
-                for session_id, session in self.sessions.items():
+                # Snapshot: Request-Threads legen parallel neue Sessions an
+                for session_id, session in list(self.sessions.items()):
                     # Sessions älter als 1 Stunde entfernen
                     if current_time - session.created_at > 3600:
                         old_sessions.append(session_id)
@@ -100,6 +104,8 @@ class SessionManager:
 class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
     """HTTP-Handler für ARXML-Merge-Requests."""
 
+    _main_page: Optional[bytes] = None
+
     def __init__(self, *args, session_manager: SessionManager, **kwargs):
         self.session_manager = session_manager
         super().__init__(*args, **kwargs)
@@ -137,8 +143,11 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
 
     def _serve_main_page(self):
         """Serviert die Haupt-HTML-Seite."""
-        html_content = self._get_main_html()
-        self._send_response(200, html_content, 'text/html')
+        # Die Seite ist statisch: einmal pro Prozess kodieren, nicht pro Request
+        page = ARXMLMergeHandler._main_page
+        if page is None:
+            page = ARXMLMergeHandler._main_page = self._get_main_html().encode('utf-8')
+        self._send_body(200, page, 'text/html')
 
     def _create_session(self):
         """Erstellt eine neue Session."""
@@ -190,16 +199,13 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
                 self._send_error(404, "Session not found")
                 return
 
-            # Lese und speichere Datei (vereinfacht)
-            post_data = self.rfile.read(content_length)
-
             # In einer echten Implementierung würde hier ein multipart-Parser verwendet
             # Für Demo-Zwecke nehmen wir an, dass die Datei direkt übertragen wird
             file_path = os.path.join(session.temp_dir, f"upload_{len(session.uploaded_files)}.arxml")
-            with open(file_path, 'wb') as f:
-                f.write(post_data)
+            written = self._stream_body_to_file(content_length, file_path)
 
             session.uploaded_files.append(file_path)
+            session.uploaded_bytes += written
 
             response = {
                 'success': True,
@@ -211,6 +217,24 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
             logger.error(f"Fehler beim Datei-Upload: {e}")
             self._send_error(500, str(e))
 
+    def _stream_body_to_file(self, content_length: int, file_path: str) -> int:
+        """Schreibt den Request-Body blockweise auf die Platte.
+        
+        Große ARXML-Uploads werden so nie komplett im Speicher gehalten.
+        Gibt die Anzahl geschriebener Bytes zurück.
+        """
+        remaining = content_length
+        written = 0
+        with open(file_path, 'wb') as f:
+            while remaining > 0:
+                chunk = self.rfile.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+                remaining -= len(chunk)
+        return written
+
     def _handle_merge_request(self):
         """Behandelt Merge-Anfragen."""
         try:
@@ -255,6 +279,8 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
     def _perform_merge(self, session: MergeSession, config: Dict[str, Any]):
         """Führt den Merge-Vorgang durch (läuft in separatem Thread)."""
         try:
+            from arxml_merger_engine import ARXMLMergerEngine, MergeStrategy
+            
             session.status = "merging"
             session.progress = 10
 
@@ -299,6 +325,8 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
     def _generate_reports(self, session: MergeSession, merge_result):
         """Generiert Berichte für das Merge-Ergebnis."""
         try:
+            from arxml_reporter import ReportGenerator, PerformanceMetrics
+            
             reporter = ReportGenerator()
 
             # Erstelle Performance-Metriken
@@ -310,7 +338,7 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
                 writing_time=0,
                 memory_peak_usage=merge_result.memory_usage,
                 input_files_count=len(session.uploaded_files),
-                total_input_size=sum(os.path.getsize(f) for f in session.uploaded_files),
+                total_input_size=session.uploaded_bytes,
                 output_size=os.path.getsize(session.result['output_file']) if session.result else 0,
                 elements_processed=0
             )
@@ -356,12 +384,17 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
 
     def _send_response(self, status_code: int, content: str, content_type: str = 'text/plain'):
         """Sendet eine HTTP-Antwort."""
+        # Nur einmal kodieren: die Bytes liefern auch die Content-Length
+        self._send_body(status_code, content.encode('utf-8'), content_type)
+
+    def _send_body(self, status_code: int, body: bytes, content_type: str):
+        """Sendet bereits kodierte Bytes als HTTP-Antwort."""
         self.send_response(status_code)
         self.send_header('Content-Type', content_type)
-        self.send_header('Content-Length', str(len(content.encode('utf-8'))))
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(content.encode('utf-8'))
+        self.wfile.write(body)
 
     def _send_json_response(self, status_code: int, data: Dict[str, Any]):
         """Sendet eine JSON-Antwort."""
@@ -836,14 +869,30 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
             });
         }
 
+        function fileKey(file) {
+            return `${file.name}|${file.size}|${file.lastModified}`;
+        }
+
         function handleFiles(files) {
+            // Set statt uploadedFiles.some(...): Duplikatprüfung in O(1) pro Datei
+            const known = new Set(uploadedFiles.map(fileKey));
+            const skipped = [];
             for (let file of files) {
-                if (file.name.toLowerCase().endsWith('.arxml') || file.name.toLowerCase().endsWith('.xml')) {
+                const name = file.name.toLowerCase();
+                if (!name.endsWith('.arxml') && !name.endsWith('.xml')) {
+                    skipped.push(file.name);
+                    continue;
+                }
+                const key = fileKey(file);
+                if (!known.has(key)) {
+                    known.add(key);
                     uploadedFiles.push(file);
-                } else {
-                    alert(`Datei ${file.name} wird übersprungen (nur .arxml/.xml Dateien unterstützt)`);
                 }
             }
+            // Ein Hinweis für alle übersprungenen Dateien statt ein Dialog pro Datei
+            if (skipped.length > 0) {
+                alert(`Folgende Dateien werden übersprungen (nur .arxml/.xml Dateien unterstützt):\\n${skipped.join('\\n')}`);
+            }
             updateFileList();
             updateMergeButton();
         }
@@ -862,6 +911,9 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
             const items = fileList.querySelectorAll('.file-item');
             items.forEach(item => item.remove());
 
+            // Alle Einträge in einem Fragment sammeln und einmal einhängen,
+            // damit der Browser nur einmal statt pro Datei neu layoutet
+            const fragment = document.createDocumentFragment();
             uploadedFiles.forEach((file, index) => {
                 const fileItem = document.createElement('div');
                 fileItem.className = 'file-item';
@@ -872,8 +924,9 @@ class ARXMLMergeHandler(http.server.BaseHTTPRequestHandler):
                     </div>
                     <button class="remove-file" onclick="removeFile(${index})">Entfernen</button>
                 `;
-                fileList.appendChild(fileItem);
+                fragment.appendChild(fileItem);
             });
+            fileList.appendChild(fragment);
         }
 
         function removeFile(index) {